@@ -6,43 +6,82 @@ determinístico de verbas rescisórias, separando responsabilidades entre
 inteligência artificial e lógica pura.
 """
 
+import asyncio
+import atexit
+import io
 import os
 import sys
-import json
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, List, Optional, TextIO
 
-# Adiciona a raiz do projeto ao PYTHONPATH
 raiz_projeto = Path(__file__).parent.parent
-sys.path.insert(0, str(raiz_projeto))
 
+# Execução direta como script: adiciona a raiz do projeto ao PYTHONPATH.
+# Importado como pacote (`agents.agent`), o caminho já está configurado.
+if __name__ == "__main__":
+    sys.path.insert(0, str(raiz_projeto))
+
+import httpx
 from agno.agent import Agent
 from agno.models.openai import OpenAIChat
 from dotenv import load_dotenv
-
+from openai import AsyncOpenAI
+from pydantic import ValidationError
+from pydantic_core import to_json
+
+from agents.comum import (
+    SEPARADOR_DUPLO,
+    SEPARADOR_SIMPLES,
+    formatar_brl,
+    limpar_json_da_resposta,
+)
 from tools.pdf_reader import LegalPDFReader
+from tools.cache_respostas import CacheRespostasIA
+from tools.pre_extrator import pre_extrair_dados_trabalhistas
 from models.schemas import DadosTrabalhistasExtraidos
-from core.calculo_trabalhista import calcular_rescisao
+from core.calculo_trabalhista import calcular_rescisao_memoizado
+
 
+# Cliente HTTP compartilhado: mantém conexões TLS abertas entre PDFs do lote.
+# HTTP/1.1 de propósito (o agno desaconselha HTTP/2 com a API da OpenAI).
+# O agno só usa `http_client` no caminho síncrono (`agent.run`); o assíncrono
+# (`agent.arun`) recebe de `processar_lote` um cliente criado a cada lote, pois
+# um `httpx.AsyncClient` fica preso ao event loop em que foi usado.
+_LIMITES_HTTP = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+_CLIENTE_HTTP = httpx.Client(limits=_LIMITES_HTTP, timeout=60.0)
+atexit.register(_CLIENTE_HTTP.close)
 
+# Modelo usado na extração e limite de caracteres do PDF enviados à IA
+# (folga na janela de contexto do modelo)
+_MODELO_IA = "gpt-4o-mini"
+_LIMITE_CARACTERES_PDF = 200_000
+
+
+@lru_cache(maxsize=1)
 def carregar_prompt_sistema() -> str:
     """
     Carrega as instruções de sistema do arquivo Markdown.
 
+    O conteúdo é lido uma única vez por processo e reutilizado nas chamadas
+    seguintes.
+
     Returns:
         String contendo o prompt completo do auditor jurídico.
     """
     # Caminho relativo à raiz do projeto
     prompt_path = raiz_projeto / "prompts" / "extrator_trabalhista.md"
     
-    if not prompt_path.exists():
+    try:
+        return prompt_path.read_bytes().decode("utf-8")
+    except FileNotFoundError:
         raise FileNotFoundError(
             f"Arquivo de prompt não encontrado: {prompt_path}\n"
             "Certifique-se de que prompts/extrator_trabalhista.md existe."
-        )
-    
-    return prompt_path.read_text(encoding="utf-8")
+        ) from None
 
 
+@lru_cache(maxsize=1)
 def gerar_exemplo_schema() -> str:
     """
     Gera um exemplo do schema esperado para guiar a IA.
@@ -76,15 +115,17 @@ def gerar_exemplo_schema() -> str:
         "multa_467_requerida": False,
         "multa_477_requerida": False
     }
-    return json.dumps(exemplo, indent=2, ensure_ascii=False)
+    # Serializador do pydantic-core (Rust): emite UTF-8 sem escapes, como ensure_ascii=False
+    return to_json(exemplo, indent=2).decode("utf-8")
 
 
-def inicializar_agente() -> Agent:
+@lru_cache(maxsize=1)
+def montar_prompt_completo() -> str:
     """
-    Configura e retorna o agente de extração jurídica.
+    Monta as instruções do agente: prompt de sistema mais o exemplo do schema.
 
     Returns:
-        Agente configurado com GPT-4o-mini, ferramentas e schema estruturado.
+        Instruções completas enviadas à IA em toda extração.
     """
     system_prompt = carregar_prompt_sistema()
     exemplo_json = gerar_exemplo_schema()
@@ -109,45 +150,47 @@ Você deve retornar EXATAMENTE este formato:
 
 IMPORTANTE: Retorne APENAS o JSON, sem texto adicional."""
 
+    return prompt_completo
+
+
+@lru_cache(maxsize=1)
+def inicializar_agente() -> Agent:
+    """
+    Configura e retorna o agente de extração jurídica.
+
+    O agente é construído na primeira chamada e reaproveitado nas seguintes,
+    evitando reler o prompt e recriar o modelo a cada PDF processado.
+
+    Returns:
+        Agente configurado com GPT-4o-mini, ferramentas e schema estruturado.
+    """
+    # O prompt de sistema é estático (sem datas ou caminhos), o que permite ao
+    # cache automático de prefixo da OpenAI reaproveitá-lo entre chamadas.
+    # Somente a mensagem do usuário (texto do PDF) varia por documento.
     agent = Agent(
-        model=OpenAIChat(id="gpt-4o-mini", temperature=0.1),  # Temperatura baixa para mais precisão
+        model=OpenAIChat(
+            id=_MODELO_IA,
+            temperature=0.1,  # Temperatura baixa para mais precisão
+            request_params={"prompt_cache_key": "jurisflow-extrator-trabalhista"},
+            http_client=_CLIENTE_HTTP,
+        ),
         description="Você é um extrator de dados jurídicos que retorna APENAS JSON estruturado.",
-        tools=[LegalPDFReader()],
         markdown=False,  # Desativa markdown para evitar code blocks
-        instructions=prompt_completo,
+        instructions=montar_prompt_completo(),
     )
     
     return agent
 
 
-def limpar_json_da_resposta(resposta: str) -> str:
+@lru_cache(maxsize=1)
+def obter_cache_respostas() -> CacheRespostasIA:
     """
-    Remove markdown code blocks e texto extra da resposta da IA.
-    
-    Args:
-        resposta: Texto bruto retornado pela IA
-        
+    Retorna o cache persistente de respostas da IA (criado uma única vez).
+
     Returns:
-        String JSON limpa
+        Cache SQLite armazenado em `.cache/` na raiz do projeto.
     """
-    # Remove markdown code blocks
-    if "```json" in resposta:
-        inicio = resposta.find("```json") + 7
-        fim = resposta.rfind("```")
-        return resposta[inicio:fim].strip()
-    elif "```" in resposta:
-        inicio = resposta.find("```") + 3
-        fim = resposta.rfind("```")
-        return resposta[inicio:fim].strip()
-    
-    # Procura por { } no texto
-    inicio_json = resposta.find("{")
-    fim_json = resposta.rfind("}") + 1
-    
-    if inicio_json != -1 and fim_json > inicio_json:
-        return resposta[inicio_json:fim_json]
-    
-    return resposta.strip()
+    return CacheRespostasIA(raiz_projeto / ".cache" / "respostas_trabalhista.sqlite3")
 
 
 def formatar_para_word(dados_extraidos: DadosTrabalhistasExtraidos, resultado_calculo: dict) -> str:
@@ -161,247 +204,302 @@ def formatar_para_word(dados_extraidos: DadosTrabalhistasExtraidos, resultado_ca
     Returns:
         String formatada sem emojis, pronta para documento oficial
     """
-    linhas = []
+    buf = io.StringIO()
+    w = buf.write
     
     # Cabeçalho
-    linhas.append("=" * 80)
-    linhas.append("RELATORIO DE CALCULO TRABALHISTA")
-    linhas.append("JurisFlow - Sistema de Calculo Juridico")
-    linhas.append("=" * 80)
-    linhas.append("")
+    w(f"{SEPARADOR_DUPLO}\n")
+    w("RELATORIO DE CALCULO TRABALHISTA\n")
+    w("JurisFlow - Sistema de Calculo Juridico\n")
+    w(f"{SEPARADOR_DUPLO}\n\n")
     
     # Identificação do Reclamante
     if dados_extraidos.nome_reclamante:
-        linhas.append("RECLAMANTE: " + dados_extraidos.nome_reclamante.upper())
-        linhas.append("")
+        w(f"RECLAMANTE: {dados_extraidos.nome_reclamante.upper()}\n\n")
     
     # Dados do Vínculo
-    linhas.append("-" * 80)
-    linhas.append("1. DADOS DO VINCULO EMPREGATICIO")
-    linhas.append("-" * 80)
-    linhas.append("")
+    w(f"{SEPARADOR_SIMPLES}\n")
+    w("1. DADOS DO VINCULO EMPREGATICIO\n")
+    w(f"{SEPARADOR_SIMPLES}\n\n")
     
     if dados_extraidos.data_admissao:
-        linhas.append(f"Data de Admissao: {dados_extraidos.data_admissao.strftime('%d/%m/%Y')}")
+        w(f"Data de Admissao: {dados_extraidos.data_admissao.strftime('%d/%m/%Y')}\n")
     
     if dados_extraidos.data_dispensa:
-        linhas.append(f"Data de Dispensa: {dados_extraidos.data_dispensa.strftime('%d/%m/%Y')}")
+        w(f"Data de Dispensa: {dados_extraidos.data_dispensa.strftime('%d/%m/%Y')}\n")
     
     if dados_extraidos.salario_base:
-        linhas.append(f"Salario Base: R$ {dados_extraidos.salario_base:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.'))
+        w(f"Salario Base: {formatar_brl(dados_extraidos.salario_base)}\n")
     
     # Adicionais
-    if dados_extraidos.adicionais:
-        tem_adicionais = False
+    adicionais = dados_extraidos.adicionais
+    if adicionais:
+        insalubridade = adicionais.insalubridade
+        periculosidade = adicionais.periculosidade
+        noturno = adicionais.noturno
         adicionais_texto = []
         
-        if dados_extraidos.adicionais.insalubridade:
-            tem_adicionais = True
-            valor = f"R$ {dados_extraidos.adicionais.insalubridade:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
-            adicionais_texto.append(f"  - Insalubridade: {valor}")
+        if insalubridade:
+            adicionais_texto.append(f"  - Insalubridade: {formatar_brl(insalubridade)}\n")
         
-        if dados_extraidos.adicionais.periculosidade:
-            tem_adicionais = True
-            valor = f"R$ {dados_extraidos.adicionais.periculosidade:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
-            adicionais_texto.append(f"  - Periculosidade: {valor}")
+        if periculosidade:
+            adicionais_texto.append(f"  - Periculosidade: {formatar_brl(periculosidade)}\n")
         
-        if dados_extraidos.adicionais.noturno:
-            tem_adicionais = True
-            valor = f"R$ {dados_extraidos.adicionais.noturno:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
-            adicionais_texto.append(f"  - Adicional Noturno: {valor}")
+        if noturno:
+            adicionais_texto.append(f"  - Adicional Noturno: {formatar_brl(noturno)}\n")
         
-        if tem_adicionais:
-            linhas.append("")
-            linhas.append("Adicionais Salariais:")
-            linhas.extend(adicionais_texto)
+        if adicionais_texto:
+            w("\nAdicionais Salariais:\n")
+            buf.writelines(adicionais_texto)
     
     if dados_extraidos.justificativa_demissao:
-        linhas.append("")
-        linhas.append(f"Tipo de Demissao: {dados_extraidos.justificativa_demissao.title()}")
+        w(f"\nTipo de Demissao: {dados_extraidos.justificativa_demissao.title()}\n")
     
     # Tempo de Serviço
     if resultado_calculo["status"] == "sucesso":
-        linhas.append("")
         ts = resultado_calculo['tempo_servico']
-        linhas.append(f"Tempo de Servico: {ts['anos']} anos, {ts['meses']} meses e {ts['dias']} dias")
-        linhas.append(f"Total em Meses: {ts['meses_totais']:.2f} meses")
+        w(f"\nTempo de Servico: {ts['anos']} anos, {ts['meses']} meses e {ts['dias']} dias\n")
+        w(f"Total em Meses: {ts['meses_totais']:.2f} meses\n")
     
-    linhas.append("")
+    w("\n")
     
     # Cálculos
     if resultado_calculo["status"] == "sucesso":
-        linhas.append("-" * 80)
-        linhas.append("2. MEMORIA DE CALCULO - VERBAS RESCISSORIAS")
-        linhas.append("-" * 80)
-        linhas.append("")
+        memoria_calculo = resultado_calculo['memoria_calculo']
+        multa_477_valor = resultado_calculo.get('multa_477_valor', 0) or 0
+        multa_467_valor = resultado_calculo.get('multa_467_valor', 0) or 0
+        
+        w(f"{SEPARADOR_SIMPLES}\n")
+        w("2. MEMORIA DE CALCULO - VERBAS RESCISSORIAS\n")
+        w(f"{SEPARADOR_SIMPLES}\n\n")
         
         if resultado_calculo.get('remuneracao_base_calculo'):
-            valor = f"R$ {resultado_calculo['remuneracao_base_calculo']:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
-            linhas.append(f"Remuneracao Base para Calculo: {valor}")
-            linhas.append("")
+            valor = formatar_brl(resultado_calculo['remuneracao_base_calculo'])
+            w(f"Remuneracao Base para Calculo: {valor}\n\n")
         
         # Verbas Rescisórias
-        for verba, detalhes in resultado_calculo['memoria_calculo'].items():
+        for verba, detalhes in memoria_calculo.items():
             if verba.startswith("multa_") and verba.endswith("_clt"):
                 continue
             
-            linhas.append(verba.upper().replace("_", " "))
-            linhas.append(f"  Descricao: {detalhes['descricao']}")
-            linhas.append(f"  Formula: {detalhes['formula']}")
-            valor = f"R$ {detalhes['valor']:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
-            linhas.append(f"  Valor: {valor}")
-            linhas.append("")
+            w(f"{verba.upper().replace('_', ' ')}\n")
+            w(f"  Descricao: {detalhes['descricao']}\n")
+            w(f"  Formula: {detalhes['formula']}\n")
+            w(f"  Valor: {formatar_brl(detalhes['valor'])}\n\n")
         
         # Subtotal
-        valor = f"R$ {resultado_calculo['total_estimado']:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
-        linhas.append(f"SUBTOTAL (Verbas Rescissorias): {valor}")
-        linhas.append("")
+        valor = formatar_brl(resultado_calculo['total_estimado'])
+        w(f"SUBTOTAL (Verbas Rescissorias): {valor}\n\n")
         
         # Multas CLT
-        tem_multas = (resultado_calculo.get('multa_477_valor', 0) > 0 or 
-                      resultado_calculo.get('multa_467_valor', 0) > 0)
+        tem_multas = multa_477_valor > 0 or multa_467_valor > 0
         
         if tem_multas:
-            linhas.append("-" * 80)
-            linhas.append("3. MULTAS CLT APLICADAS")
-            linhas.append("-" * 80)
-            linhas.append("")
+            w(f"{SEPARADOR_SIMPLES}\n")
+            w("3. MULTAS CLT APLICADAS\n")
+            w(f"{SEPARADOR_SIMPLES}\n\n")
             
-            if resultado_calculo.get('multa_477_valor', 0) > 0:
-                multa_477 = resultado_calculo['memoria_calculo'].get('multa_477_clt', {})
-                linhas.append("MULTA ART. 477 CLT (Atraso no Pagamento)")
-                linhas.append(f"  Descricao: {multa_477.get('descricao', 'N/A')}")
-                linhas.append(f"  Formula: {multa_477.get('formula', 'N/A')}")
-                valor = f"R$ {resultado_calculo['multa_477_valor']:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
-                linhas.append(f"  Valor: {valor}")
-                linhas.append("")
+            if multa_477_valor > 0:
+                multa_477 = memoria_calculo.get('multa_477_clt', {})
+                w("MULTA ART. 477 CLT (Atraso no Pagamento)\n")
+                w(f"  Descricao: {multa_477.get('descricao', 'N/A')}\n")
+                w(f"  Formula: {multa_477.get('formula', 'N/A')}\n")
+                w(f"  Valor: {formatar_brl(multa_477_valor)}\n\n")
             
-            if resultado_calculo.get('multa_467_valor', 0) > 0:
-                multa_467 = resultado_calculo['memoria_calculo'].get('multa_467_clt', {})
-                linhas.append("MULTA ART. 467 CLT (Verbas Incontroversas - 50%)")
-                linhas.append(f"  Descricao: {multa_467.get('descricao', 'N/A')}")
-                linhas.append(f"  Formula: {multa_467.get('formula', 'N/A')}")
-                valor = f"R$ {resultado_calculo['multa_467_valor']:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
-                linhas.append(f"  Valor: {valor}")
-                linhas.append("")
+            if multa_467_valor > 0:
+                multa_467 = memoria_calculo.get('multa_467_clt', {})
+                w("MULTA ART. 467 CLT (Verbas Incontroversas - 50%)\n")
+                w(f"  Descricao: {multa_467.get('descricao', 'N/A')}\n")
+                w(f"  Formula: {multa_467.get('formula', 'N/A')}\n")
+                w(f"  Valor: {formatar_brl(multa_467_valor)}\n\n")
             
-            subtotal_multas = resultado_calculo['multa_477_valor'] + resultado_calculo['multa_467_valor']
-            valor = f"R$ {subtotal_multas:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
-            linhas.append(f"SUBTOTAL DAS MULTAS: {valor}")
-            linhas.append("")
+            subtotal_multas = multa_477_valor + multa_467_valor
+            w(f"SUBTOTAL DAS MULTAS: {formatar_brl(subtotal_multas)}\n\n")
         
         # Total Geral
-        linhas.append("=" * 80)
-        valor = f"R$ {resultado_calculo['total_geral']:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
-        linhas.append(f"TOTAL GERAL (Verbas + Multas): {valor}")
-        linhas.append("=" * 80)
-        linhas.append("")
+        w(f"{SEPARADOR_DUPLO}\n")
+        w(f"TOTAL GERAL (Verbas + Multas): {formatar_brl(resultado_calculo['total_geral'])}\n")
+        w(f"{SEPARADOR_DUPLO}\n\n")
         
         # Observações
         if resultado_calculo['observacoes']:
-            linhas.append("-" * 80)
-            linhas.append("4. OBSERVACOES")
-            linhas.append("-" * 80)
-            linhas.append("")
+            w(f"{SEPARADOR_SIMPLES}\n")
+            w("4. OBSERVACOES\n")
+            w(f"{SEPARADOR_SIMPLES}\n\n")
             for i, obs in enumerate(resultado_calculo['observacoes'], 1):
-                linhas.append(f"{i}. {obs}")
-            linhas.append("")
+                w(f"{i}. {obs}\n")
+            w("\n")
     
     else:
-        linhas.append("-" * 80)
-        linhas.append("ERRO NO CALCULO")
-        linhas.append("-" * 80)
-        linhas.append("")
-        linhas.append(f"Motivo: {resultado_calculo['erro']}")
-        linhas.append("")
+        w(f"{SEPARADOR_SIMPLES}\n")
+        w("ERRO NO CALCULO\n")
+        w(f"{SEPARADOR_SIMPLES}\n\n")
+        w(f"Motivo: {resultado_calculo['erro']}\n\n")
     
     # Rodapé
-    linhas.append("-" * 80)
+    w(f"{SEPARADOR_SIMPLES}\n")
     if resultado_calculo.get('data_calculo'):
-        linhas.append(f"Data do Calculo: {resultado_calculo['data_calculo']}")
-    linhas.append("Documento gerado pelo sistema JurisFlow")
-    linhas.append("=" * 80)
+        w(f"Data do Calculo: {resultado_calculo['data_calculo']}\n")
+    w("Documento gerado pelo sistema JurisFlow\n")
+    w(SEPARADOR_DUPLO)
     
-    return "\n".join(linhas)
+    return buf.getvalue()
 
 
-def processar_reclamacao(caminho_pdf: str) -> dict:
+def _preparar_extracao(caminho_pdf: str, saida: TextIO) -> tuple:
     """
-    Pipeline completo: Extração (IA) → Cálculo (Lógica Pura).
+    Valida o PDF e tenta evitar a chamada à IA (cache ou pré-extração).
 
     Args:
         caminho_pdf: Caminho para o arquivo PDF da reclamação trabalhista.
+        saida: Buffer que acumula as mensagens de progresso do PDF.
 
     Returns:
-        Dicionário com resultados da extração e do cálculo.
+        Tupla (chave_cache, resposta_em_cache, dados_pre_extraidos, texto_pdf).
+        A resposta é None em caso de miss; os dados pré-extraídos são None
+        quando o PDF não segue um modelo de petição reconhecido e a IA deve
+        ser chamada com `texto_pdf`.
 
     Raises:
         FileNotFoundError: Se o PDF não existir.
+        ValueError: Se o texto do PDF não puder ser extraído.
     """
-    # Validação do arquivo
-    pdf_path = Path(caminho_pdf)
-    if not pdf_path.exists():
+    cache = obter_cache_respostas()
+    
+    # A leitura do PDF para gerar a chave do cache também valida sua existência.
+    # Tudo o que altera a resposta da IA entra na chave: instruções completas
+    # (com o exemplo do schema), modelo e limite de texto enviado.
+    try:
+        chave_cache = cache.gerar_chave(
+            caminho_pdf,
+            montar_prompt_completo(),
+            _MODELO_IA,
+            str(_LIMITE_CARACTERES_PDF)
+        )
+    except FileNotFoundError:
         raise FileNotFoundError(
             f"Arquivo nao encontrado: {caminho_pdf}\n"
             f"Crie uma pasta 'documentos/' e adicione um PDF de teste."
-        )
+        ) from None
     
-    print(f"Processando: {pdf_path.name}")
-    print("=" * 80)
+    print(f"Processando: {Path(caminho_pdf).name}", file=saida)
+    print(SEPARADOR_DUPLO, file=saida)
     
     # 1. EXTRAÇÃO VIA IA
-    print("\nFASE 1: Extracao de Dados (GPT-4o-mini)")
-    print("-" * 80)
+    print("\nFASE 1: Extracao de Dados (GPT-4o-mini)", file=saida)
+    print(SEPARADOR_SIMPLES, file=saida)
     
-    agent = inicializar_agente()
+    # Documentos idênticos reaproveitam a resposta já obtida da IA
+    resposta_texto = cache.obter(chave_cache)
     
-    response = agent.run(
-        f"Extraia os dados trabalhistas do arquivo: {caminho_pdf}\n\n"
-        f"Retorne APENAS o JSON no formato especificado, sem texto adicional.",
-        stream=False
-    )
+    if resposta_texto is not None:
+        print("Resposta recuperada do cache (PDF ja processado).", file=saida)
+        return chave_cache, resposta_texto, None, None
     
-    resposta_texto = response.content
+    # O texto é extraído uma única vez: serve à pré-extração e à consulta da IA
+    texto_pdf = LegalPDFReader().read_pdf_text(caminho_pdf)
+    
+    # Mensagem de erro/aviso do leitor não é o texto da petição: não vai à IA
+    # (nem, por consequência, ao cache de respostas)
+    if texto_pdf.startswith(("Erro", "Aviso")):
+        print(texto_pdf, file=saida)
+        raise ValueError(texto_pdf)
+    
+    # Petições padronizadas (campos rotulados) dispensam a chamada à IA
+    dados_pre_extraidos = pre_extrair_dados_trabalhistas(texto_pdf)
+    if dados_pre_extraidos is not None:
+        print("Dados extraidos por modelo de peticao (IA dispensada).", file=saida)
+    
+    return chave_cache, None, dados_pre_extraidos, texto_pdf
+
+
+def _montar_consulta(texto_pdf: str) -> str:
+    """Monta a mensagem do usuário com o texto do PDF já extraído."""
+    return (
+        f"Extraia os dados trabalhistas do seguinte processo:\n\n"
+        f"{texto_pdf[:_LIMITE_CARACTERES_PDF]}\n\n"
+        f"Retorne APENAS o JSON no formato especificado, sem texto adicional."
+    )
+
+
+def _interpretar_resposta(
+    resposta_texto: Optional[str],
+    chave_cache: str,
+    em_cache: bool,
+    saida: TextIO
+) -> DadosTrabalhistasExtraidos:
+    """
+    Valida a resposta da IA e a armazena no cache quando válida.
+
+    Args:
+        resposta_texto: Texto bruto retornado pela IA (ou recuperado do cache);
+            None quando a IA não devolve conteúdo.
+        chave_cache: Chave do PDF no cache de respostas.
+        em_cache: True se a resposta veio do cache.
+        saida: Buffer que acumula as mensagens de progresso do PDF.
+
+    Returns:
+        Dados extraídos, ou objeto vazio se a resposta for inválida.
+    """
+    # Resposta vazia (ou só com chamadas de ferramenta) chega como None:
+    # vira texto vazio e cai no objeto vazio, como qualquer JSON inválido
+    resposta_texto = str(resposta_texto or "")
     
-    # Parse da resposta
     try:
         json_limpo = limpar_json_da_resposta(resposta_texto)
-        dados_dict = json.loads(json_limpo)
-        dados_extraidos = DadosTrabalhistasExtraidos(**dados_dict)
+        dados_extraidos = DadosTrabalhistasExtraidos.model_validate_json(json_limpo)
         
-        print("JSON validado com sucesso!")
+        print("JSON validado com sucesso!", file=saida)
         
-    except json.JSONDecodeError as e:
-        print(f"Erro ao parsear JSON: {e}")
-        print(f"\nJSON extraido:\n{json_limpo[:300]}...")
-        print("\nCriando objeto vazio para demonstracao...")
-        dados_extraidos = DadosTrabalhistasExtraidos()
+        # Só armazena respostas que passaram na validação
+        if not em_cache:
+            obter_cache_respostas().salvar(chave_cache, resposta_texto)
         
-    except Exception as e:
-        print(f"Erro na validacao Pydantic: {e}")
-        print("\nCriando objeto vazio para demonstracao...")
-        dados_extraidos = DadosTrabalhistasExtraidos()
+    except ValidationError as e:
+        if any(erro["type"] == "json_invalid" for erro in e.errors()):
+            print(f"Erro ao parsear JSON: {e}", file=saida)
+            print(f"\nJSON extraido:\n{json_limpo[:300]}...", file=saida)
+        else:
+            print(f"Erro na validacao Pydantic: {e}", file=saida)
+        print("\nCriando objeto vazio para demonstracao...", file=saida)
+        # Objeto vazio só com os defaults: dispensa a validação do Pydantic
+        dados_extraidos = DadosTrabalhistasExtraidos.model_construct()
     
+    return dados_extraidos
+
+
+def _concluir_processamento(dados_extraidos: DadosTrabalhistasExtraidos, saida: TextIO) -> dict:
+    """
+    Calcula as verbas rescisórias e formata o relatório.
+
+    Args:
+        dados_extraidos: Dados estruturados da reclamação.
+        saida: Buffer que acumula as mensagens de progresso do PDF.
+
+    Returns:
+        Dicionário com resultados da extração e do cálculo.
+    """
     # 2. CÁLCULO DETERMINÍSTICO
-    print("\n" + "=" * 80)
-    print("FASE 2: Calculo de Verbas Rescissorias (Core)")
-    print("-" * 80)
+    print("\n" + SEPARADOR_DUPLO, file=saida)
+    print("FASE 2: Calculo de Verbas Rescissorias (Core)", file=saida)
+    print(SEPARADOR_SIMPLES, file=saida)
     
-    resultado_calculo = calcular_rescisao(dados_extraidos)
+    resultado_calculo = calcular_rescisao_memoizado(dados_extraidos)
     
     # 3. FORMATAÇÃO PARA WORD
-    print("\n" + "=" * 80)
-    print("RELATORIO FORMATADO PARA WORD")
-    print("=" * 80)
-    print("\n")
+    print("\n" + SEPARADOR_DUPLO, file=saida)
+    print("RELATORIO FORMATADO PARA WORD", file=saida)
+    print(SEPARADOR_DUPLO, file=saida)
+    print("\n", file=saida)
     
     texto_formatado = formatar_para_word(dados_extraidos, resultado_calculo)
-    print(texto_formatado)
+    print(texto_formatado, file=saida)
     
-    print("\n" + "=" * 80)
-    print("FIM DO RELATORIO")
-    print("=" * 80)
+    print("\n" + SEPARADOR_DUPLO, file=saida)
+    print("FIM DO RELATORIO", file=saida)
+    print(SEPARADOR_DUPLO, file=saida)
     
+    # Único model_dump do fluxo: o dicionário faz parte do contrato de retorno
     return {
         "dados_extraidos": dados_extraidos.model_dump(),
         "calculo": resultado_calculo,
@@ -409,8 +507,124 @@ def processar_reclamacao(caminho_pdf: str) -> dict:
     }
 
 
+def processar_reclamacao(caminho_pdf: str) -> dict:
+    """
+    Pipeline completo: Extração (IA) → Cálculo (Lógica Pura).
+
+    Args:
+        caminho_pdf: Caminho para o arquivo PDF da reclamação trabalhista.
+
+    Returns:
+        Dicionário com resultados da extração e do cálculo.
+
+    Raises:
+        FileNotFoundError: Se o PDF não existir.
+        ValueError: Se o texto do PDF não puder ser extraído.
+    """
+    # Mensagens acumuladas e escritas de uma só vez ao final
+    saida = io.StringIO()
+    
+    try:
+        chave_cache, resposta_texto, dados_extraidos, texto_pdf = _preparar_extracao(caminho_pdf, saida)
+        
+        if dados_extraidos is None:
+            em_cache = resposta_texto is not None
+            
+            if not em_cache:
+                agent = inicializar_agente()
+                response = agent.run(_montar_consulta(texto_pdf), stream=False)
+                resposta_texto = response.content
+            
+            dados_extraidos = _interpretar_resposta(resposta_texto, chave_cache, em_cache, saida)
+        
+        return _concluir_processamento(dados_extraidos, saida)
+    finally:
+        sys.stdout.write(saida.getvalue())
+
+
+async def processar_reclamacao_async(caminho_pdf: str) -> dict:
+    """
+    Versão assíncrona de `processar_reclamacao`, usando `agent.arun`.
+
+    A espera pela IA libera o event loop, permitindo processar vários PDFs
+    em paralelo com o mesmo agente.
+
+    Args:
+        caminho_pdf: Caminho para o arquivo PDF da reclamação trabalhista.
+
+    Returns:
+        Dicionário com resultados da extração e do cálculo.
+
+    Raises:
+        FileNotFoundError: Se o PDF não existir.
+        ValueError: Se o texto do PDF não puder ser extraído.
+    """
+    # Buffer próprio por PDF: a saída de tarefas concorrentes não se intercala
+    saida = io.StringIO()
+    
+    try:
+        # Leitura do PDF em thread, para não bloquear o event loop
+        chave_cache, resposta_texto, dados_extraidos, texto_pdf = await asyncio.to_thread(
+            _preparar_extracao, caminho_pdf, saida
+        )
+        
+        if dados_extraidos is None:
+            em_cache = resposta_texto is not None
+            
+            if not em_cache:
+                agent = inicializar_agente()
+                response = await agent.arun(_montar_consulta(texto_pdf), stream=False)
+                resposta_texto = response.content
+            
+            dados_extraidos = _interpretar_resposta(resposta_texto, chave_cache, em_cache, saida)
+        
+        return _concluir_processamento(dados_extraidos, saida)
+    finally:
+        sys.stdout.write(saida.getvalue())
+
+
+async def processar_lote(caminhos_pdf: List[str], max_concorrencia: int = 8) -> List[Any]:
+    """
+    Processa vários PDFs em paralelo, limitando as chamadas simultâneas à IA.
+
+    As chamadas do lote compartilham um cliente HTTP assíncrono, criado e
+    fechado dentro do event loop do lote.
+
+    Args:
+        caminhos_pdf: Caminhos dos PDFs de reclamações trabalhistas.
+        max_concorrencia: Máximo de PDFs processados ao mesmo tempo.
+
+    Returns:
+        Lista na mesma ordem de `caminhos_pdf`, contendo o dicionário de
+        resultados de cada PDF ou a exceção que interrompeu seu processamento.
+    """
+    semaforo = asyncio.Semaphore(max_concorrencia)
+    
+    async def processar_com_limite(caminho_pdf: str) -> dict:
+        async with semaforo:
+            return await processar_reclamacao_async(caminho_pdf)
+    
+    async with httpx.AsyncClient(limits=_LIMITES_HTTP, timeout=60.0) as cliente_http:
+        modelo = inicializar_agente().model
+        modelo.async_client = AsyncOpenAI(http_client=cliente_http)
+        
+        try:
+            return await asyncio.gather(
+                *(processar_com_limite(caminho) for caminho in caminhos_pdf),
+                return_exceptions=True
+            )
+        finally:
+            # Fora do lote, o agno volta a criar o próprio cliente assíncrono
+            modelo.async_client = None
+
+
 def main():
-    """Ponto de entrada principal do sistema."""
+    """
+    Ponto de entrada principal do sistema.
+
+    Aceita opcionalmente um PDF ou uma pasta de PDFs como argumento; pastas
+    são processadas em lote, com chamadas paralelas à IA.
+    """
     load_dotenv()
     
     if not os.getenv("OPENAI_API_KEY"):
@@ -419,9 +633,19 @@ def main():
         return
     
     print("🏛️  JurisFlow - Sistema de Cálculo Jurídico Trabalhista")
-    print("=" * 80)
+    print(SEPARADOR_DUPLO)
     
-    caminho_pdf = "documentos/processo_exemplo.pdf"
+    caminho_pdf = sys.argv[1] if len(sys.argv) > 1 else "documentos/processo_exemplo.pdf"
+    
+    if Path(caminho_pdf).is_dir():
+        caminhos = sorted(str(p) for p in Path(caminho_pdf).glob("*.pdf"))
+        resultados = asyncio.run(processar_lote(caminhos))
+        
+        falhas = [(c, r) for c, r in zip(caminhos, resultados) if isinstance(r, BaseException)]
+        for caminho, erro in falhas:
+            print(f"\n❌ {caminho}: {type(erro).__name__} - {erro}")
+        print(f"\n✅ Lote concluído: {len(caminhos) - len(falhas)} de {len(caminhos)} PDFs processados.")
+        return
     
     try:
         resultado = processar_reclamacao(caminho_pdf)
@@ -439,4 +663,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
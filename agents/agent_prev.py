@@ -5,31 +5,93 @@ Este módulo orquestra a extração de dados via IA (GPT-4o-mini) e o cálculo
 de atrasados com correção monetária por índices oficiais do Banco Central.
 """
 
+import asyncio
+import io
 import os
+import re
 import sys
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, TextIO, Tuple
 
-# Adiciona a raiz do projeto ao PYTHONPATH
 raiz_projeto = Path(__file__).parent.parent
-sys.path.insert(0, str(raiz_projeto))
+
+# Execução direta como script: adiciona a raiz do projeto ao PYTHONPATH.
+# Importado como pacote (`agents.agent_prev`), o caminho já está configurado.
+if __name__ == "__main__":
+    sys.path.insert(0, str(raiz_projeto))
 
 from datetime import date
 
-from agno.agent import Agent
-from agno.models.openai import OpenAIChat
 from dotenv import load_dotenv
+from pydantic import ValidationError
+from pydantic_core import from_json
 
-from tools.pdf_reader import LegalPDFReader
+from agents.comum import (
+    SEPARADOR_DUPLO,
+    SEPARADOR_SIMPLES,
+    formatar_brl,
+    limpar_json_da_resposta,
+)
+from tools.cache_respostas import CacheRespostasIA
 from models.schemas_prev import DadosPrevidenciarios
-from core.financeiro_bcb import GerenteFinanceiroBCB
 from core.lookup_data import obter_salario_minimo, validar_rmi
 
+if TYPE_CHECKING:
+    from agno.agent import Agent
+    from core.financeiro_bcb import GerenteFinanceiroBCB
+    from openai import OpenAI
+
+
+# Resposta de lote: array JSON com um objeto por caso
+_ARRAY_JSON_RE = re.compile(r"\[.*\]", re.DOTALL)
+
+# Limite de caracteres dos PDFs enviados à IA em uma única chamada
+# (folga na janela de contexto; dividido entre os casos de um lote)
+_LIMITE_CARACTERES_PDF = 200_000
+
+# Menções a benefício de um salário mínimo nas observações extraídas
+# (aceita variações de acentuação e de caixa)
+_SALARIO_MINIMO_RE = re.compile(
+    r"sal[áa]rio\s+m[íi]nimo|benef[íi]cio\s+de\s+piso|piso\s+previdenci[áa]rio"
+    r"|valor\s+m[íi]nimo|sm\s+vigente",
+    re.IGNORECASE
+)
 
+_MODELO_IA = "gpt-4o-mini"
+_DESCRICAO_AGENTE = "Contador Previdenciário Especialista em extração de dados do INSS"
+
+# Estados finais de um job da Batch API da OpenAI
+_ESTADOS_FINAIS_BATCH = {"completed", "failed", "expired", "cancelled"}
+
+# Exemplo de resposta incluído no prompt. Fixo: mantido como literal em vez de
+# montar e serializar um dicionário (mesma saída de json.dumps com indent=2).
+_EXEMPLO_JSON = """{
+  "nome_segurado": "Maria da Silva Oliveira",
+  "tipo_beneficio": "Aposentadoria por Invalidez",
+  "dib": "2021-06-15",
+  "dip": null,
+  "rmi": 1500.0,
+  "tem_adicional_25": false,
+  "indice_correcao": "SELIC",
+  "observacoes": [
+    "Benefício concedido judicialmente sob protocolo NB 187.654.321-0",
+    "Sentença transitada em julgado em 10/12/2023"
+  ]
+}"""
+
+
+@lru_cache(maxsize=1)
 def carregar_prompt_sistema() -> str:
     """
     Carrega as instruções de sistema do arquivo Markdown.
 
+    O conteúdo é lido uma única vez por processo e reutilizado nas chamadas
+    seguintes.
+
     Returns:
         String contendo o prompt completo do contador previdenciário.
         
@@ -39,44 +101,34 @@ def carregar_prompt_sistema() -> str:
     # Caminho relativo à raiz do projeto
     prompt_path = raiz_projeto / "prompts" / "extrator_previdenciario.md"
     
-    if not prompt_path.exists():
+    try:
+        return prompt_path.read_bytes().decode("utf-8")
+    except FileNotFoundError:
         raise FileNotFoundError(
             f"Arquivo de prompt não encontrado: {prompt_path}\n"
             "Certifique-se de que prompts/extrator_previdenciario.md existe."
-        )
-    
-    return prompt_path.read_text(encoding="utf-8")
+        ) from None
 
 
 def gerar_exemplo_schema() -> str:
     """
-    Gera um exemplo do schema esperado para guiar a IA.
+    Retorna um exemplo do schema esperado para guiar a IA.
     
     Returns:
         String JSON com exemplo do formato esperado.
     """
-    exemplo = {
-        "nome_segurado": "Maria da Silva Oliveira",
-        "tipo_beneficio": "Aposentadoria por Invalidez",
-        "dib": "2021-06-15",
-        "dip": None,
-        "rmi": 1500.0,
-        "tem_adicional_25": False,
-        "indice_correcao": "SELIC",
-        "observacoes": [
-            "Benefício concedido judicialmente sob protocolo NB 187.654.321-0",
-            "Sentença transitada em julgado em 10/12/2023"
-        ]
-    }
-    return json.dumps(exemplo, indent=2, ensure_ascii=False)
+    return _EXEMPLO_JSON
 
 
-def inicializar_agente() -> Agent:
+@lru_cache(maxsize=1)
+def montar_instrucoes() -> str:
     """
-    Configura e retorna o agente de extração previdenciária.
+    Monta as instruções completas do extrator (prompt + exemplo de resposta).
+
+    Usadas tanto pelo agente quanto pelas requisições da Batch API.
 
     Returns:
-        Agente configurado com GPT-4o-mini, ferramentas e schema estruturado.
+        String com o prompt de sistema seguido do exemplo de JSON esperado.
     """
     system_prompt = carregar_prompt_sistema()
     exemplo_json = gerar_exemplo_schema()
@@ -99,46 +151,114 @@ Você deve retornar EXATAMENTE este formato:
 ```
 
 IMPORTANTE: Retorne APENAS o JSON, sem texto adicional."""
+    
+    return prompt_completo
+
 
+@lru_cache(maxsize=1)
+def inicializar_agente() -> "Agent":
+    """
+    Configura e retorna o agente de extração previdenciária.
+
+    O agente é construído na primeira chamada e reaproveitado nas seguintes,
+    evitando reler o prompt e recriar o modelo a cada ação processada.
+
+    Returns:
+        Agente configurado com GPT-4o-mini e schema estruturado. O texto do
+        PDF é enviado na própria mensagem (ver `extrair_texto_pdf`), sem
+        ferramenta de leitura.
+    """
+    # Importação tardia: o agno (e o SDK da OpenAI) só é carregado por
+    # processos que de fato chamam a IA
+    from agno.agent import Agent
+    from agno.models.openai import OpenAIChat
+    
     agent = Agent(
-        model=OpenAIChat(id="gpt-4o-mini", temperature=0.1),  # Temperatura baixa para precisão
-        description="Contador Previdenciário Especialista em extração de dados do INSS",
-        tools=[LegalPDFReader()],
+        model=OpenAIChat(id=_MODELO_IA, temperature=0.1),  # Temperatura baixa para precisão
+        description=_DESCRICAO_AGENTE,
         markdown=False,  # Desativa markdown para evitar code blocks
-        instructions=prompt_completo,
+        instructions=montar_instrucoes(),
+        # Instância compartilhada entre PDFs (e tarefas concorrentes): sem
+        # histórico, cada execução depende apenas da mensagem enviada
+        add_history_to_context=False,
+        # Limites de taxa e timeouts da API: novas tentativas com espera crescente
+        retries=2,
+        exponential_backoff=True,
     )
     
     return agent
 
 
-def limpar_json_da_resposta(resposta: str) -> str:
+@lru_cache(maxsize=1)
+def obter_cache_textos_pdf() -> CacheRespostasIA:
+    """
+    Retorna o cache persistente de textos extraídos dos PDFs (criado uma única vez).
+
+    Returns:
+        Cache SQLite armazenado em `.cache/` na raiz do projeto.
+    """
+    return CacheRespostasIA(raiz_projeto / ".cache" / "textos_pdf.sqlite3")
+
+
+@lru_cache(maxsize=1)
+def obter_gerente_bcb() -> "GerenteFinanceiroBCB":
     """
-    Remove markdown code blocks e texto extra da resposta da IA.
+    Retorna o gerente financeiro do BCB compartilhado entre os PDFs.
+
+    Returns:
+        Instância única de `GerenteFinanceiroBCB` (sem estado por cálculo),
+        com as séries do SGS persistidas em `.cache/` na raiz do projeto.
+    """
+    # Importação tardia: o python-bcb (e o pandas) só é carregado quando há
+    # cálculo de atrasados
+    from core.financeiro_bcb import GerenteFinanceiroBCB
+    from tools.cache_series import CacheSeriesSGS
     
+    return GerenteFinanceiroBCB(
+        cache_series=CacheSeriesSGS(raiz_projeto / ".cache" / "series_sgs.sqlite3")
+    )
+
+
+def extrair_texto_pdf(caminho_pdf: str) -> str:
+    """
+    Extrai o texto do PDF, reaproveitando extrações anteriores do mesmo arquivo.
+
+    O cache é indexado pelo SHA-256 do conteúdo: reprocessar um PDF já visto
+    (ex: ajustando apenas o contexto adicional) dispensa um novo parse.
+
     Args:
-        resposta: Texto bruto retornado pela IA
-        
+        caminho_pdf: Caminho para o arquivo PDF.
+
     Returns:
-        String JSON limpa
+        Texto extraído por `LegalPDFReader.read_pdf_text`, ou a mensagem de
+        erro/aviso do leitor (nunca armazenada no cache).
     """
-    # Remove markdown code blocks
-    if "```json" in resposta:
-        inicio = resposta.find("```json") + 7
-        fim = resposta.rfind("```")
-        return resposta[inicio:fim].strip()
-    elif "```" in resposta:
-        inicio = resposta.find("```") + 3
-        fim = resposta.rfind("```")
-        return resposta[inicio:fim].strip()
+    cache = obter_cache_textos_pdf()
+    chave = cache.gerar_chave(caminho_pdf)
+    texto = cache.obter(chave)
     
-    # Procura por { } no texto
-    inicio_json = resposta.find("{")
-    fim_json = resposta.rfind("}") + 1
+    if texto is None:
+        # Importação tardia: o leitor é um Toolkit do agno
+        from tools.pdf_reader import LegalPDFReader
+        
+        texto = LegalPDFReader().read_pdf_text(caminho_pdf)
+        if not texto.startswith(("Erro", "Aviso")):
+            cache.salvar(chave, texto)
     
-    if inicio_json != -1 and fim_json > inicio_json:
-        return resposta[inicio_json:fim_json]
+    return texto
+
+
+def _montar_consulta(texto_pdf: str, contexto_adicional: str) -> str:
+    """Monta a mensagem do usuário com o texto do PDF e as notas do advogado."""
+    consulta = (
+        f"Extraia os dados previdenciários do seguinte processo:\n\n"
+        f"{texto_pdf[:_LIMITE_CARACTERES_PDF]}"
+    )
     
-    return resposta.strip()
+    if contexto_adicional:
+        consulta += f"\n\nCONTEXTO ADICIONAL DO USUARIO:\n{contexto_adicional}"
+    
+    return consulta + "\n\nRetorne os dados estruturados conforme o schema."
 
 
 def detectar_salario_minimo_dinamico(dados: DadosPrevidenciarios) -> bool:
@@ -189,347 +309,357 @@ def detectar_salario_minimo_dinamico(dados: DadosPrevidenciarios) -> bool:
             pass
     
     # 3. Verifica observações por palavras-chave
-    if dados.observacoes:
-        palavras_chave_sm = [
-            "salário mínimo",
-            "salario minimo",
-            "um salário mínimo",
-            "1 salário mínimo",
-            "benefício de piso",
-            "piso previdenciário",
-            "valor mínimo",
-            "sm vigente"
-        ]
-        
-        observacoes_lower = [obs.lower() for obs in dados.observacoes]
-        texto_observacoes = " ".join(observacoes_lower)
-        
-        for palavra_chave in palavras_chave_sm:
-            if palavra_chave in texto_observacoes:
-                return True
+    if dados.observacoes and _SALARIO_MINIMO_RE.search(" ".join(dados.observacoes)):
+        return True
     
     # 4. Se passou por todos os testes, é um valor fixo
     return False
 
 
+# Cabeçalho fixo do relatório (montado uma única vez)
+_CABECALHO_RELATORIO = (
+    f"{SEPARADOR_DUPLO}\n"
+    "RELATORIO DE CALCULO DE ATRASADOS PREVIDENCIARIOS\n"
+    "JurisFlow - Sistema de Calculo Juridico\n"
+    f"{SEPARADOR_DUPLO}\n"
+)
+
+
+def _titulo_secao(titulo: str) -> str:
+    """Título de seção entre separadores simples, seguido de linha em branco."""
+    return f"{SEPARADOR_SIMPLES}\n{titulo}\n{SEPARADOR_SIMPLES}\n\n"
+
+
+def _secao_beneficio(dados: DadosPrevidenciarios, usar_sm_dinamico: bool) -> str:
+    """Seção 1: dados do benefício e modo da RMI."""
+    tipo = f"Tipo de Beneficio: {dados.tipo_beneficio}\n" if dados.tipo_beneficio else ""
+    dib = f"DIB (Data de Inicio do Beneficio): {dados.dib.strftime('%d/%m/%Y')}\n" if dados.dib else ""
+    dip = f"DIP (Data de Inicio do Pagamento): {dados.dip.strftime('%d/%m/%Y')}\n" if dados.dip else ""
+    
+    # RMI (com campo especial para salário mínimo dinâmico)
+    valor_rmi = dados.rmi
+    tem_adicional_25 = dados.tem_adicional_25
+    if usar_sm_dinamico:
+        linhas_rmi = "RMI (Renda Mensal Inicial): SALARIO MINIMO NACIONAL (atualizado mensalmente)\n"
+        if tem_adicional_25:
+            linhas_rmi += "  + Adicional de 25% (Grande Invalidez) aplicado sobre cada competencia\n"
+    elif valor_rmi:
+        linhas_rmi = f"RMI (Renda Mensal Inicial): {formatar_brl(valor_rmi)} (Valor Fixo)\n"
+        if tem_adicional_25:
+            linhas_rmi += f"RMI com Adicional de 25% (Grande Invalidez): {formatar_brl(valor_rmi * 1.25)}\n"
+    else:
+        linhas_rmi = ""
+    
+    return (
+        f"{_titulo_secao('1. DADOS DO BENEFICIO PREVIDENCIARIO')}"
+        f"{tipo}{dib}{dip}{linhas_rmi}"
+        f"Indice de Correcao: {dados.indice_correcao}\n"
+    )
+
+
+def _secao_lista(titulo: str, itens: Optional[List[str]]) -> str:
+    """Seção com itens numerados (observações); vazia se não houver itens."""
+    if not itens:
+        return ""
+    numerados = "".join(f"{i}. {item}\n" for i, item in enumerate(itens, 1))
+    return f"{_titulo_secao(titulo)}{numerados}"
+
+
+def _secao_calculo(resultado_calculo: dict) -> str:
+    """Seção 3: período, base de cálculo e totais corrigidos."""
+    usar_sm_dinamico = resultado_calculo.get('usar_salario_minimo_dinamico')
+    
+    # Base de cálculo
+    if usar_sm_dinamico:
+        base = (
+            "BASE DE CALCULO: Salario Minimo Nacional (atualizado mensalmente)\n"
+            "  O valor foi ajustado conforme os reajustes oficiais em cada competencia.\n"
+        )
+    else:
+        base = f"RMI Base (Valor Fixo): {formatar_brl(resultado_calculo['rmi_base'])}\n"
+    
+    if not resultado_calculo['tem_adicional_25']:
+        adicional = ""
+    elif usar_sm_dinamico:
+        adicional = "  + Adicional de 25% (Grande Invalidez) sobre cada competencia\n"
+    else:
+        adicional = f"RMI com Adicional de 25%: {formatar_brl(resultado_calculo['rmi_com_adicional'])}\n"
+    
+    # Taxa acumulada percentual: (total_corrigido / total_sem_correcao - 1) * 100
+    total_sem_correcao = resultado_calculo['total_devido_sem_correcao']
+    total_corrigido = resultado_calculo['total_corrigido']
+    taxa = ""
+    if total_sem_correcao > 0:
+        taxa_acumulada_percentual = ((total_corrigido / total_sem_correcao) - 1) * 100
+        taxa = f"Taxa de Correcao Acumulada: {taxa_acumulada_percentual:.4f}%\n"
+    
+    return (
+        f"{_titulo_secao('3. CALCULO DE ATRASADOS COM CORRECAO MONETARIA')}"
+        "Periodo de Atraso:\n"
+        f"  Data Inicial (DIB): {resultado_calculo['data_inicio']}\n"
+        f"  Data Final: {resultado_calculo['data_fim']}\n"
+        f"  Total de Meses em Atraso: {resultado_calculo['total_meses']}\n"
+        "\n"
+        f"{base}{adicional}"
+        "\n"
+        f"Total Devido (sem correcao): {formatar_brl(total_sem_correcao)}\n"
+        "\n"
+        f"Indice Aplicado: {resultado_calculo['indice_aplicado']}\n"
+        f"{taxa}"
+        "\n"
+        f"{SEPARADOR_DUPLO}\n"
+        f"TOTAL CORRIGIDO: {formatar_brl(total_corrigido)}\n"
+        f"Diferenca pela Correcao: {formatar_brl(resultado_calculo['diferenca_correcao'])}\n"
+        f"{SEPARADOR_DUPLO}\n"
+    )
+
+
+def _linhas_competencias(meses: List[dict]) -> str:
+    """Linhas de memória de cálculo (original x fator = corrigido) por competência."""
+    return "".join(
+        f"  {mes_info['competencia']} ({mes_info.get('tipo', 'RMI Mensal')}):\n"
+        f"    Original: {formatar_brl(mes_info['valor_original'])} x "
+        f"Fator: {mes_info.get('fator_correcao', 1.0):.6f} = "
+        f"Corrigido: {formatar_brl(mes_info['valor_corrigido'])}\n"
+        for mes_info in meses
+    )
+
+
+def _secao_memoria(memoria: List[dict]) -> str:
+    """Seção 4: memória mensal (amostra dos 3 primeiros e 3 últimos meses)."""
+    if len(memoria) > 6:
+        return (
+            f"{_titulo_secao('4. MEMORIA DE CALCULO MENSAL (Amostra)')}"
+            "Primeiros 3 Meses:\n"
+            f"{_linhas_competencias(memoria[:3])}"
+            "\n"
+            f"[... {len(memoria) - 6} competencias intermediarias ...]\n"
+            "\n"
+            "Ultimos 3 Meses:\n"
+            f"{_linhas_competencias(memoria[-3:])}"
+        )
+    
+    if memoria:
+        # Se tiver até 6 meses, mostra todos
+        return (
+            f"{_titulo_secao('4. MEMORIA DE CALCULO MENSAL (Completa)')}"
+            f"{_linhas_competencias(memoria)}"
+        )
+    
+    return ""
+
+
+def _secao_rodape(resultado_calculo: dict) -> str:
+    """Rodapé com a data do cálculo e a identificação do módulo."""
+    data_calculo = resultado_calculo.get('data_calculo')
+    linha_data = f"Data do Calculo: {data_calculo}\n" if data_calculo else ""
+    return (
+        f"{SEPARADOR_SIMPLES}\n"
+        f"{linha_data}"
+        "Documento gerado pelo sistema JurisFlow\n"
+        "Modulo: Calculos Previdenciarios\n"
+        f"{SEPARADOR_DUPLO}"
+    )
+
+
 def formatar_relatorio_previdenciario(
     dados: DadosPrevidenciarios,
-    resultado_calculo: dict
-) -> str:
+    resultado_calculo: dict,
+    out: Optional[TextIO] = None
+) -> Optional[str]:
     """
     Formata os resultados em texto limpo, pronto para copiar no Word.
     
+    Cada seção é montada por um helper como um único bloco de texto e escrita
+    diretamente no destino; seções ausentes (vazias) são omitidas.
+    
     Args:
         dados: Dados estruturados extraídos pela IA.
         resultado_calculo: Resultado do cálculo de atrasados com correção.
+        out: Destino do relatório (ex: `sys.stdout` ou arquivo aberto). Se
+            omitido, o relatório é montado em memória e retornado.
         
     Returns:
-        String formatada sem emojis, pronta para documento oficial.
+        String formatada sem emojis, pronta para documento oficial, ou None
+        quando o relatório foi escrito em `out`.
     """
-    linhas = []
-    
-    # Cabeçalho
-    linhas.append("=" * 80)
-    linhas.append("RELATORIO DE CALCULO DE ATRASADOS PREVIDENCIARIOS")
-    linhas.append("JurisFlow - Sistema de Calculo Juridico")
-    linhas.append("=" * 80)
-    linhas.append("")
-    
-    # Identificação do Segurado
-    if dados.nome_segurado:
-        linhas.append("SEGURADO: " + dados.nome_segurado.upper())
-        linhas.append("")
-    
-    # Dados do Benefício
-    linhas.append("-" * 80)
-    linhas.append("1. DADOS DO BENEFICIO PREVIDENCIARIO")
-    linhas.append("-" * 80)
-    linhas.append("")
-    
-    if dados.tipo_beneficio:
-        linhas.append(f"Tipo de Beneficio: {dados.tipo_beneficio}")
+    segurado = f"SEGURADO: {dados.nome_segurado.upper()}\n" if dados.nome_segurado else ""
     
-    if dados.dib:
-        linhas.append(f"DIB (Data de Inicio do Beneficio): {dados.dib.strftime('%d/%m/%Y')}")
-    
-    if dados.dip:
-        linhas.append(f"DIP (Data de Inicio do Pagamento): {dados.dip.strftime('%d/%m/%Y')}")
-    
-    # RMI (com campo especial para salário mínimo dinâmico)
-    if resultado_calculo.get('usar_salario_minimo_dinamico'):
-        linhas.append("RMI (Renda Mensal Inicial): SALARIO MINIMO NACIONAL (atualizado mensalmente)")
-        
-        if dados.tem_adicional_25:
-            linhas.append("  + Adicional de 25% (Grande Invalidez) aplicado sobre cada competencia")
-    elif dados.rmi:
-        valor_rmi = f"R$ {dados.rmi:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
-        linhas.append(f"RMI (Renda Mensal Inicial): {valor_rmi} (Valor Fixo)")
-        
-        if dados.tem_adicional_25:
-            rmi_com_adicional = dados.rmi * 1.25
-            valor_total = f"R$ {rmi_com_adicional:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
-            linhas.append(f"RMI com Adicional de 25% (Grande Invalidez): {valor_total}")
-    
-    linhas.append(f"Indice de Correcao: {dados.indice_correcao}")
-    linhas.append("")
-    
-    # Observações do Processo
-    if dados.observacoes:
-        linhas.append("-" * 80)
-        linhas.append("2. OBSERVACOES DO PROCESSO")
-        linhas.append("-" * 80)
-        linhas.append("")
-        for i, obs in enumerate(dados.observacoes, 1):
-            linhas.append(f"{i}. {obs}")
-        linhas.append("")
-    
-    # Cálculo de Atrasados
     if resultado_calculo["status"] == "sucesso":
-        linhas.append("-" * 80)
-        linhas.append("3. CALCULO DE ATRASADOS COM CORRECAO MONETARIA")
-        linhas.append("-" * 80)
-        linhas.append("")
-        
-        linhas.append(f"Periodo de Atraso:")
-        linhas.append(f"  Data Inicial (DIB): {resultado_calculo['data_inicio']}")
-        linhas.append(f"  Data Final: {resultado_calculo['data_fim']}")
-        linhas.append(f"  Total de Meses em Atraso: {resultado_calculo['total_meses']}")
-        linhas.append("")
-        
-        # Base de cálculo
-        if resultado_calculo.get('usar_salario_minimo_dinamico'):
-            linhas.append("BASE DE CALCULO: Salario Minimo Nacional (atualizado mensalmente)")
-            linhas.append("  O valor foi ajustado conforme os reajustes oficiais em cada competencia.")
-        else:
-            valor_base = f"R$ {resultado_calculo['rmi_base']:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
-            linhas.append(f"RMI Base (Valor Fixo): {valor_base}")
-        
-        if resultado_calculo['tem_adicional_25']:
-            if resultado_calculo.get('usar_salario_minimo_dinamico'):
-                linhas.append("  + Adicional de 25% (Grande Invalidez) sobre cada competencia")
-            else:
-                valor_adicional = f"R$ {resultado_calculo['rmi_com_adicional']:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
-                linhas.append(f"RMI com Adicional de 25%: {valor_adicional}")
-        
-        linhas.append("")
-        
-        valor_sem_correcao = f"R$ {resultado_calculo['total_devido_sem_correcao']:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
-        linhas.append(f"Total Devido (sem correcao): {valor_sem_correcao}")
-        linhas.append("")
-        
-        linhas.append(f"Indice Aplicado: {resultado_calculo['indice_aplicado']}")
-        
-        # Calcula taxa acumulada percentual: (total_corrigido / total_sem_correcao - 1) * 100
-        if resultado_calculo['total_devido_sem_correcao'] > 0:
-            taxa_acumulada_percentual = ((resultado_calculo['total_corrigido'] / resultado_calculo['total_devido_sem_correcao']) - 1) * 100
-            linhas.append(f"Taxa de Correcao Acumulada: {taxa_acumulada_percentual:.4f}%")
-        
-        linhas.append("")
-        
-        valor_corrigido = f"R$ {resultado_calculo['total_corrigido']:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
-        valor_diferenca = f"R$ {resultado_calculo['diferenca_correcao']:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
-        
-        linhas.append("=" * 80)
-        linhas.append(f"TOTAL CORRIGIDO: {valor_corrigido}")
-        linhas.append(f"Diferenca pela Correcao: {valor_diferenca}")
-        linhas.append("=" * 80)
-        linhas.append("")
-        
-        # Memória de Cálculo Mensal (Amostra dos primeiros e últimos 3 meses)
-        memoria = resultado_calculo.get('memoria_mensal', [])
-        
-        if len(memoria) > 6:
-            linhas.append("-" * 80)
-            linhas.append("4. MEMORIA DE CALCULO MENSAL (Amostra)")
-            linhas.append("-" * 80)
-            linhas.append("")
-            linhas.append("Primeiros 3 Meses:")
-            for mes_info in memoria[:3]:
-                competencia = mes_info['competencia']
-                tipo = mes_info.get('tipo', 'RMI Mensal')
-                valor_original = f"R$ {mes_info['valor_original']:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
-                valor_corrigido = f"R$ {mes_info['valor_corrigido']:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
-                fator = mes_info.get('fator_correcao', 1.0)
-                linhas.append(f"  {competencia} ({tipo}):")
-                linhas.append(f"    Original: {valor_original} x Fator: {fator:.6f} = Corrigido: {valor_corrigido}")
-            
-            linhas.append("")
-            linhas.append(f"[... {len(memoria) - 6} competencias intermediarias ...]")
-            linhas.append("")
-            
-            linhas.append("Ultimos 3 Meses:")
-            for mes_info in memoria[-3:]:
-                competencia = mes_info['competencia']
-                tipo = mes_info.get('tipo', 'RMI Mensal')
-                valor_original = f"R$ {mes_info['valor_original']:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
-                valor_corrigido = f"R$ {mes_info['valor_corrigido']:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
-                fator = mes_info.get('fator_correcao', 1.0)
-                linhas.append(f"  {competencia} ({tipo}):")
-                linhas.append(f"    Original: {valor_original} x Fator: {fator:.6f} = Corrigido: {valor_corrigido}")
-            
-            linhas.append("")
-        elif len(memoria) > 0:
-            # Se tiver menos de 6 meses, mostra todos
-            linhas.append("-" * 80)
-            linhas.append("4. MEMORIA DE CALCULO MENSAL (Completa)")
-            linhas.append("-" * 80)
-            linhas.append("")
-            for mes_info in memoria:
-                competencia = mes_info['competencia']
-                tipo = mes_info.get('tipo', 'RMI Mensal')
-                valor_original = f"R$ {mes_info['valor_original']:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
-                valor_corrigido = f"R$ {mes_info['valor_corrigido']:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
-                fator = mes_info.get('fator_correcao', 1.0)
-                linhas.append(f"  {competencia} ({tipo}):")
-                linhas.append(f"    Original: {valor_original} x Fator: {fator:.6f} = Corrigido: {valor_corrigido}")
-            linhas.append("")
-        
-        # Observações Técnicas
-        if resultado_calculo.get('observacoes'):
-            linhas.append("-" * 80)
-            linhas.append("5. OBSERVACOES TECNICAS")
-            linhas.append("-" * 80)
-            linhas.append("")
-            for i, obs in enumerate(resultado_calculo['observacoes'], 1):
-                linhas.append(f"{i}. {obs}")
-            linhas.append("")
-    
+        secoes_calculo = (
+            _secao_calculo(resultado_calculo),
+            _secao_memoria(resultado_calculo.get('memoria_mensal', [])),
+            _secao_lista("5. OBSERVACOES TECNICAS", resultado_calculo.get('observacoes')),
+        )
     else:
-        linhas.append("-" * 80)
-        linhas.append("ERRO NO CALCULO")
-        linhas.append("-" * 80)
-        linhas.append("")
-        linhas.append(f"Motivo: {resultado_calculo.get('erro', 'Erro desconhecido')}")
-        linhas.append("")
+        motivo = resultado_calculo.get('erro', 'Erro desconhecido')
+        secoes_calculo = (f"{_titulo_secao('ERRO NO CALCULO')}Motivo: {motivo}\n",)
+    
+    destino = io.StringIO() if out is None else out
+    w = destino.write
     
-    # Rodapé
-    linhas.append("-" * 80)
-    if resultado_calculo.get('data_calculo'):
-        linhas.append(f"Data do Calculo: {resultado_calculo['data_calculo']}")
-    linhas.append("Documento gerado pelo sistema JurisFlow")
-    linhas.append("Modulo: Calculos Previdenciarios")
-    linhas.append("=" * 80)
+    w(_CABECALHO_RELATORIO)
+    for secao in (
+        segurado,
+        _secao_beneficio(dados, bool(resultado_calculo.get('usar_salario_minimo_dinamico'))),
+        _secao_lista("2. OBSERVACOES DO PROCESSO", dados.observacoes),
+        *secoes_calculo,
+        _secao_rodape(resultado_calculo),
+    ):
+        if secao:
+            w("\n")
+            w(secao)
     
-    return "\n".join(linhas)
+    return destino.getvalue() if out is None else None
 
 
-def processar_acao_previdenciaria(
-    caminho_pdf: str,
-    contexto_adicional: str = ""
-) -> dict:
+def _interpretar_resposta(resposta_texto: Optional[str], saida: TextIO) -> DadosPrevidenciarios:
     """
-    Pipeline completo: Extração (IA) → Cálculo (BCB + Lógica).
+    Converte a resposta da IA em dados previdenciários validados.
 
     Args:
-        caminho_pdf: Caminho para o arquivo PDF da ação previdenciária.
-        contexto_adicional: Notas do advogado (RMI, datas, etc).
+        resposta_texto: Texto bruto retornado pela IA (None quando vazia).
+        saida: Destino das mensagens de progresso.
 
     Returns:
-        Dicionário com resultados da extração e do cálculo.
-
-    Raises:
-        FileNotFoundError: Se o PDF não existir.
+        Dados extraídos, ou objeto vazio se a resposta for inválida.
     """
-    # Validação do arquivo
-    pdf_path = Path(caminho_pdf)
-    if not pdf_path.exists():
-        raise FileNotFoundError(
-            f"Arquivo não encontrado: {caminho_pdf}\n"
-            f"Adicione um PDF de ação previdenciária na pasta 'documentos/'."
-        )
-    
-    print(f"Processando: {pdf_path.name}")
-    print("=" * 80)
+    # Resposta vazia (ou só com chamadas de ferramenta) chega como None:
+    # vira texto vazio e cai no objeto vazio, como qualquer JSON inválido
+    resposta_texto = str(resposta_texto or "")
     
-    # 1. EXTRAÇÃO VIA IA
-    print("\nFASE 1: Extração de Dados Previdenciários (GPT-4o-mini)")
-    print("-" * 80)
-    
-    agent = inicializar_agente()
+    try:
+        json_limpo = limpar_json_da_resposta(resposta_texto)
+        # Parse e validação em uma única passada pelo pydantic-core
+        dados_extraidos = DadosPrevidenciarios.model_validate_json(json_limpo)
+        
+        print("✓ Dados extraídos e validados com sucesso!", file=saida)
+        print(f"  - Segurado: {dados_extraidos.nome_segurado or 'N/A'}", file=saida)
+        print(f"  - Tipo de Benefício: {dados_extraidos.tipo_beneficio or 'N/A'}", file=saida)
+        print(f"  - RMI: R$ {dados_extraidos.rmi:.2f}" if dados_extraidos.rmi else "  - RMI: Não informada", file=saida)
+        print(f"  - DIB: {dados_extraidos.dib}" if dados_extraidos.dib else "  - DIB: Não informada", file=saida)
+        
+    except ValidationError as e:
+        if any(erro["type"] == "json_invalid" for erro in e.errors()):
+            print(f"✗ Erro ao parsear JSON: {e}", file=saida)
+            print(f"\nJSON extraído:\n{json_limpo[:300]}...", file=saida)
+        else:
+            print(f"✗ Erro na validação Pydantic: {e}", file=saida)
+        print("\nCriando objeto vazio para demonstração...", file=saida)
+        dados_extraidos = DadosPrevidenciarios()
     
-    # Monta a query com contexto adicional se fornecido
-    query = f"Analise este PDF: {caminho_pdf}"
+    return dados_extraidos
+
+
+def _interpretar_lote(
+    resposta_texto: Optional[str],
+    quantidade: int,
+    saida: TextIO
+) -> List[Optional[DadosPrevidenciarios]]:
+    """
+    Converte a resposta de um lote (array JSON) em dados por caso.
+
+    Args:
+        resposta_texto: Texto bruto retornado pela IA (None quando vazia).
+        quantidade: Número de casos enviados no lote.
+        saida: Destino das mensagens de progresso.
+
+    Returns:
+        Lista com `quantidade` itens, na ordem dos casos. Casos ausentes ou
+        inválidos na resposta viram None (devem ser reenviados isoladamente).
+    """
+    correspondencia = _ARRAY_JSON_RE.search(str(resposta_texto or ""))
     
-    if contexto_adicional:
-        query += f"\n\nCONTEXTO ADICIONAL DO USUARIO:\n{contexto_adicional}"
+    try:
+        itens = from_json(correspondencia.group(0)) if correspondencia else []
+    except ValueError as e:
+        print(f"✗ Erro ao parsear JSON do lote: {e}", file=saida)
+        itens = []
     
-    query += "\n\nRetorne os dados estruturados conforme o schema."
+    if len(itens) != quantidade:
+        print(f"⚠ AVISO: a IA retornou {len(itens)} caso(s) para {quantidade} PDF(s) do lote.", file=saida)
     
-    response = agent.run(query, stream=False)
+    dados_lote = []
+    for item in itens[:quantidade]:
+        try:
+            dados_lote.append(DadosPrevidenciarios.model_validate(item))
+        except Exception as e:
+            print(f"✗ Erro na validação Pydantic: {e}", file=saida)
+            dados_lote.append(None)
     
-    resposta_texto = response.content
+    dados_lote.extend(None for _ in range(quantidade - len(dados_lote)))
     
-    # Parse da resposta
-    try:
-        json_limpo = limpar_json_da_resposta(resposta_texto)
-        dados_dict = json.loads(json_limpo)
-        dados_extraidos = DadosPrevidenciarios(**dados_dict)
-        
-        print("✓ Dados extraídos e validados com sucesso!")
-        print(f"  - Segurado: {dados_extraidos.nome_segurado or 'N/A'}")
-        print(f"  - Tipo de Benefício: {dados_extraidos.tipo_beneficio or 'N/A'}")
-        print(f"  - RMI: R$ {dados_extraidos.rmi:.2f}" if dados_extraidos.rmi else "  - RMI: Não informada")
-        print(f"  - DIB: {dados_extraidos.dib}" if dados_extraidos.dib else "  - DIB: Não informada")
-        
-    except json.JSONDecodeError as e:
-        print(f"✗ Erro ao parsear JSON: {e}")
-        print(f"\nJSON extraído:\n{json_limpo[:300]}...")
-        print("\nCriando objeto vazio para demonstração...")
-        dados_extraidos = DadosPrevidenciarios()
-        
-    except Exception as e:
-        print(f"✗ Erro na validação Pydantic: {e}")
-        print("\nCriando objeto vazio para demonstração...")
-        dados_extraidos = DadosPrevidenciarios()
+    return dados_lote
+
+
+def _concluir_processamento(
+    dados_extraidos: DadosPrevidenciarios,
+    saida: TextIO,
+    gerar_relatorio: bool = True
+) -> dict:
+    """
+    Detecta o modo da RMI, calcula os atrasados e formata o relatório.
+
+    Args:
+        dados_extraidos: Dados previdenciários extraídos pela IA.
+        saida: Destino das mensagens de progresso e do relatório.
+        gerar_relatorio: Se False, o relatório para Word não é montado.
+
+    Returns:
+        Dicionário com resultados da extração e do cálculo.
+    """
+    # Campos usados várias vezes abaixo, lidos uma única vez
+    dib = dados_extraidos.dib
+    rmi = dados_extraidos.rmi
     
     # ===== NOVA LÓGICA: DETECÇÃO DE SALÁRIO MÍNIMO DINÂMICO =====
     usar_sm_dinamico = False
     
-    if dados_extraidos.dib:  # Só detecta se tiver DIB
+    if dib:  # Só detecta se tiver DIB
         usar_sm_dinamico = detectar_salario_minimo_dinamico(dados_extraidos)
         
         if usar_sm_dinamico:
-            print("\n🔍 DETECÇÃO AUTOMÁTICA:")
-            print("  ✓ Benefício identificado como SALÁRIO MÍNIMO DINÂMICO")
-            print("  → Os reajustes legais do salário mínimo serão aplicados automaticamente")
-            print("    em cada competencia (conforme Lei vigente).")
+            print("\n🔍 DETECÇÃO AUTOMÁTICA:", file=saida)
+            print("  ✓ Benefício identificado como SALÁRIO MÍNIMO DINÂMICO", file=saida)
+            print("  → Os reajustes legais do salário mínimo serão aplicados automaticamente", file=saida)
+            print("    em cada competencia (conforme Lei vigente).", file=saida)
         else:
-            print("\n🔍 DETECÇÃO AUTOMÁTICA:")
-            print("  ✓ Benefício identificado como VALOR FIXO")
-            if dados_extraidos.rmi:
-                print(f"  → Será usado o valor de R$ {dados_extraidos.rmi:.2f} para todas as competências.")
+            print("\n🔍 DETECÇÃO AUTOMÁTICA:", file=saida)
+            print("  ✓ Benefício identificado como VALOR FIXO", file=saida)
+            if rmi:
+                print(f"  → Será usado o valor de R$ {rmi:.2f} para todas as competências.", file=saida)
     
     # 2. CÁLCULO DE ATRASADOS
     resultado_calculo = {}
     texto_formatado = None
     
     # Valida se tem os dados mínimos para calcular
-    pode_calcular = dados_extraidos.dib is not None
+    pode_calcular = dib is not None
     
     if not usar_sm_dinamico:
-        pode_calcular = pode_calcular and dados_extraidos.rmi and dados_extraidos.rmi > 0
+        pode_calcular = pode_calcular and rmi and rmi > 0
     
     if pode_calcular:
-        print("\n" + "=" * 80)
-        print("FASE 2: Cálculo de Atrasados com Correção Monetária (BCB)")
-        print("-" * 80)
+        print("\n" + SEPARADOR_DUPLO, file=saida)
+        print("FASE 2: Cálculo de Atrasados com Correção Monetária (BCB)", file=saida)
+        print(SEPARADOR_SIMPLES, file=saida)
         
         # Define data final (hoje ou DIP, se fornecida)
         data_fim = dados_extraidos.dip if dados_extraidos.dip else date.today()
         
         # Validação da RMI (se não for salário mínimo dinâmico)
-        if not usar_sm_dinamico and dados_extraidos.rmi:
-            valido, mensagem = validar_rmi(dados_extraidos.rmi, dados_extraidos.dib)
+        if not usar_sm_dinamico and rmi:
+            valido, mensagem = validar_rmi(rmi, dib)
             if not valido:
-                print(f"\n⚠ AVISO DE VALIDAÇÃO: {mensagem}")
-                print("  O cálculo prosseguirá, mas revise o valor informado.")
+                print(f"\n⚠ AVISO DE VALIDAÇÃO: {mensagem}", file=saida)
+                print("  O cálculo prosseguirá, mas revise o valor informado.", file=saida)
         
-        gerente_bcb = GerenteFinanceiroBCB()
+        gerente_bcb = obter_gerente_bcb()
         
         # ===== CHAMA O CÁLCULO COM O FLAG CORRETO =====
         resultado_calculo = gerente_bcb.calcular_atrasados(
-            rmi=dados_extraidos.rmi if not usar_sm_dinamico else 0.0,  # Passa 0 se for dinâmico
-            data_inicio=dados_extraidos.dib,
+            rmi=rmi if not usar_sm_dinamico else 0.0,  # Passa 0 se for dinâmico
+            data_inicio=dib,
             data_fim=data_fim,
             indice=dados_extraidos.indice_correcao,
             tem_adicional_25=dados_extraidos.tem_adicional_25,
@@ -537,41 +667,42 @@ def processar_acao_previdenciaria(
         )
         
         if resultado_calculo["status"] == "sucesso":
-            print(f"✓ Cálculo concluído!")
-            print(f"  - Período: {dados_extraidos.dib} até {data_fim}")
-            print(f"  - Total de meses: {resultado_calculo['total_meses']}")
-            print(f"  - Índice aplicado: {resultado_calculo['indice_aplicado']}")
+            print(f"✓ Cálculo concluído!", file=saida)
+            print(f"  - Período: {dib} até {data_fim}", file=saida)
+            print(f"  - Total de meses: {resultado_calculo['total_meses']}", file=saida)
+            print(f"  - Índice aplicado: {resultado_calculo['indice_aplicado']}", file=saida)
             
             if usar_sm_dinamico:
-                print(f"  - Modo: SALÁRIO MÍNIMO DINÂMICO (atualizado mensalmente)")
+                print(f"  - Modo: SALÁRIO MÍNIMO DINÂMICO (atualizado mensalmente)", file=saida)
             else:
-                print(f"  - Modo: VALOR FIXO (R$ {dados_extraidos.rmi:.2f})")
-            
-            print(f"  - Total corrigido: R$ {resultado_calculo['total_corrigido']:,.2f}")
+                print(f"  - Modo: VALOR FIXO (R$ {rmi:.2f})", file=saida)
             
-            # 3. FORMATAÇÃO PARA WORD (só se cálculo teve sucesso)
-            print("\n" + "=" * 80)
-            print("RELATÓRIO FORMATADO PARA WORD")
-            print("=" * 80)
-            print("\n")
+            print(f"  - Total corrigido: R$ {resultado_calculo['total_corrigido']:,.2f}", file=saida)
             
-            texto_formatado = formatar_relatorio_previdenciario(dados_extraidos, resultado_calculo)
-            print(texto_formatado)
-            
-            print("\n" + "=" * 80)
-            print("FIM DO RELATÓRIO")
-            print("=" * 80)
+            # 3. FORMATAÇÃO PARA WORD (só se cálculo teve sucesso e foi pedida)
+            if gerar_relatorio:
+                print("\n" + SEPARADOR_DUPLO, file=saida)
+                print("RELATÓRIO FORMATADO PARA WORD", file=saida)
+                print(SEPARADOR_DUPLO, file=saida)
+                print("\n", file=saida)
+                
+                texto_formatado = formatar_relatorio_previdenciario(dados_extraidos, resultado_calculo)
+                print(texto_formatado, file=saida)
+                
+                print("\n" + SEPARADOR_DUPLO, file=saida)
+                print("FIM DO RELATÓRIO", file=saida)
+                print(SEPARADOR_DUPLO, file=saida)
         else:
-            print(f"✗ Erro no cálculo: {resultado_calculo['erro']}")
+            print(f"✗ Erro no cálculo: {resultado_calculo['erro']}", file=saida)
     
     else:
-        print("\n⚠ AVISO: Cálculo de atrasados não executado.")
-        if not dados_extraidos.dib:
-            print("  - DIB não encontrada no documento.")
-        if not usar_sm_dinamico and (not dados_extraidos.rmi or dados_extraidos.rmi <= 0):
-            print("  - RMI não informada ou inválida.")
-            print("  - Forneça a RMI no 'Contexto Adicional' (ex: 'RMI de R$ 1.500,00')")
-            print("  - Ou informe que é um benefício de salário mínimo.")
+        print("\n⚠ AVISO: Cálculo de atrasados não executado.", file=saida)
+        if not dib:
+            print("  - DIB não encontrada no documento.", file=saida)
+        if not usar_sm_dinamico and (not rmi or rmi <= 0):
+            print("  - RMI não informada ou inválida.", file=saida)
+            print("  - Forneça a RMI no 'Contexto Adicional' (ex: 'RMI de R$ 1.500,00')", file=saida)
+            print("  - Ou informe que é um benefício de salário mínimo.", file=saida)
         
         resultado_calculo = {
             "status": "nao_executado",
@@ -586,8 +717,455 @@ def processar_acao_previdenciaria(
     }
 
 
+def _erro_pdf_ausente(*caminhos_pdfs: str) -> FileNotFoundError:
+    """Monta o erro padrão para um ou mais PDFs inexistentes."""
+    return FileNotFoundError(
+        f"Arquivo não encontrado: {', '.join(caminhos_pdfs)}\n"
+        f"Adicione um PDF de ação previdenciária na pasta 'documentos/'."
+    )
+
+
+def _validar_lote(caminhos_pdfs: List[str]) -> Tuple[List[str], List[str]]:
+    """
+    Verifica, em paralelo, quais PDFs de um lote existem.
+
+    Feita uma única vez na entrada do lote, evita iniciar tarefas (e chamadas
+    à IA) para arquivos que falhariam de qualquer forma.
+
+    Args:
+        caminhos_pdfs: Caminhos dos PDFs do lote.
+
+    Returns:
+        Tupla (caminhos válidos, caminhos ausentes), ambos na ordem original.
+    """
+    if not caminhos_pdfs:
+        return [], []
+    
+    with ThreadPoolExecutor(max_workers=min(32, len(caminhos_pdfs))) as executor:
+        existentes = list(executor.map(os.path.isfile, caminhos_pdfs))
+    
+    validos = [c for c, existe in zip(caminhos_pdfs, existentes) if existe]
+    ausentes = [c for c, existe in zip(caminhos_pdfs, existentes) if not existe]
+    
+    return validos, ausentes
+
+
+def _iniciar_processamento(caminho_pdf: str, contexto_adicional: str, saida: TextIO) -> str:
+    """
+    Valida o PDF, imprime o cabeçalho e monta a consulta para a IA.
+
+    Args:
+        caminho_pdf: Caminho para o arquivo PDF da ação previdenciária.
+        contexto_adicional: Notas do advogado (RMI, datas, etc).
+        saida: Destino das mensagens de progresso.
+
+    Returns:
+        Mensagem do usuário a ser enviada ao agente.
+
+    Raises:
+        FileNotFoundError: Se o PDF não existir.
+    """
+    # Validação do arquivo (um único stat)
+    if not os.path.isfile(caminho_pdf):
+        raise _erro_pdf_ausente(caminho_pdf)
+    
+    pdf_path = Path(caminho_pdf)
+    
+    print(f"Processando: {pdf_path.name}", file=saida)
+    print(SEPARADOR_DUPLO, file=saida)
+    
+    # 1. EXTRAÇÃO VIA IA
+    print("\nFASE 1: Extração de Dados Previdenciários (GPT-4o-mini)", file=saida)
+    print(SEPARADOR_SIMPLES, file=saida)
+    
+    return _montar_consulta(extrair_texto_pdf(caminho_pdf), contexto_adicional)
+
+
+def processar_acao_previdenciaria(
+    caminho_pdf: str,
+    contexto_adicional: str = "",
+    gerar_relatorio: bool = True,
+    imprimir: bool = True
+) -> dict:
+    """
+    Pipeline completo: Extração (IA) → Cálculo (BCB + Lógica).
+
+    Args:
+        caminho_pdf: Caminho para o arquivo PDF da ação previdenciária.
+        contexto_adicional: Notas do advogado (RMI, datas, etc).
+        gerar_relatorio: Se False, pula a formatação do relatório para Word
+            (`relatorio_word` retorna None). Útil quando só o cálculo importa.
+        imprimir: Se False, nada é escrito no stdout.
+
+    Returns:
+        Dicionário com resultados da extração e do cálculo.
+
+    Raises:
+        FileNotFoundError: Se o PDF não existir.
+    """
+    # Buffer próprio por PDF, escrito de uma vez ao final
+    saida = io.StringIO()
+    
+    try:
+        query = _iniciar_processamento(caminho_pdf, contexto_adicional, saida)
+        
+        response = inicializar_agente().run(query, stream=False)
+        
+        dados_extraidos = _interpretar_resposta(response.content, saida)
+        
+        return _concluir_processamento(dados_extraidos, saida, gerar_relatorio)
+    finally:
+        if imprimir:
+            sys.stdout.write(saida.getvalue())
+
+
+async def processar_acao_previdenciaria_async(
+    caminho_pdf: str,
+    contexto_adicional: str = "",
+    gerar_relatorio: bool = True,
+    imprimir: bool = True
+) -> dict:
+    """
+    Versão assíncrona de `processar_acao_previdenciaria`, usando `agent.arun`.
+
+    A espera pela IA libera o event loop e o cálculo com o BCB (HTTP
+    bloqueante) roda em thread, permitindo processar várias ações em paralelo.
+
+    Args:
+        caminho_pdf: Caminho para o arquivo PDF da ação previdenciária.
+        contexto_adicional: Notas do advogado (RMI, datas, etc).
+        gerar_relatorio: Se False, pula a formatação do relatório para Word.
+        imprimir: Se False, nada é escrito no stdout.
+
+    Returns:
+        Dicionário com resultados da extração e do cálculo.
+
+    Raises:
+        FileNotFoundError: Se o PDF não existir.
+    """
+    # Buffer próprio por PDF: a saída de tarefas concorrentes não se intercala
+    saida = io.StringIO()
+    
+    try:
+        # Leitura do PDF em thread, para não bloquear o event loop
+        query = await asyncio.to_thread(_iniciar_processamento, caminho_pdf, contexto_adicional, saida)
+        
+        response = await inicializar_agente().arun(query, stream=False)
+        
+        dados_extraidos = _interpretar_resposta(response.content, saida)
+        
+        return await asyncio.to_thread(
+            _concluir_processamento, dados_extraidos, saida, gerar_relatorio
+        )
+    finally:
+        if imprimir:
+            sys.stdout.write(saida.getvalue())
+
+
+async def processar_muitos(
+    caminhos_pdfs: List[str],
+    contextos: Optional[List[str]] = None,
+    max_concorrencia: int = 10,
+    gerar_relatorio: bool = True,
+    imprimir: bool = True
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Processa várias ações em paralelo, entregando cada resultado ao concluir.
+
+    Gerador assíncrono: o chamador pode persistir cada resultado enquanto as
+    demais ações ainda aguardam a IA ou o BCB, por exemplo:
+
+        async for caminho, resultado in processar_muitos(caminhos):
+            salvar(caminho, resultado)
+
+    Args:
+        caminhos_pdfs: Caminhos dos PDFs das ações previdenciárias.
+        contextos: Notas do advogado para cada PDF (mesma ordem), opcional.
+        max_concorrencia: Máximo de ações processadas ao mesmo tempo.
+        gerar_relatorio: Se False, pula a formatação dos relatórios para Word.
+        imprimir: Se False, nada é escrito no stdout.
+
+    Yields:
+        Tuplas (caminho do PDF, resultado) na ordem de conclusão. O resultado
+        é o dicionário de `processar_acao_previdenciaria` ou a exceção que
+        interrompeu o processamento daquele PDF.
+
+    Raises:
+        ValueError: Se `contextos` não tiver um item por PDF.
+    """
+    if contextos is None:
+        contextos = [""] * len(caminhos_pdfs)
+    
+    if len(contextos) != len(caminhos_pdfs):
+        raise ValueError("Informe um contexto adicional para cada PDF (ou nenhum).")
+    
+    # PDFs ausentes recebem o erro direto, sem ocupar uma vaga do semáforo
+    _, ausentes = _validar_lote(caminhos_pdfs)
+    ausentes = set(ausentes)
+    
+    semaforo = asyncio.Semaphore(max_concorrencia)
+    
+    async def processar_com_limite(caminho_pdf: str, contexto_adicional: str) -> Tuple[str, Any]:
+        if caminho_pdf in ausentes:
+            return caminho_pdf, _erro_pdf_ausente(caminho_pdf)
+        async with semaforo:
+            try:
+                return caminho_pdf, await processar_acao_previdenciaria_async(
+                    caminho_pdf, contexto_adicional, gerar_relatorio, imprimir
+                )
+            except Exception as e:
+                return caminho_pdf, e
+    
+    tarefas = [
+        asyncio.create_task(processar_com_limite(c, ctx))
+        for c, ctx in zip(caminhos_pdfs, contextos)
+    ]
+    
+    try:
+        for proxima in asyncio.as_completed(tarefas):
+            yield await proxima
+    finally:
+        # Chamador interrompeu a iteração: cancela o que ainda está pendente
+        for tarefa in tarefas:
+            tarefa.cancel()
+
+
+def processar_lote_previdenciario(
+    caminhos_pdfs: List[str],
+    contextos: Optional[List[str]] = None,
+    batch_size: int = 8
+) -> List[dict]:
+    """
+    Processa várias ações enviando até `batch_size` PDFs por chamada à IA.
+
+    Cada chamada leva os textos dos PDFs delimitados por `### CASO i ###` e
+    recebe um array JSON com uma extração por caso, reduzindo o número de
+    requisições de N para N / batch_size. Casos ausentes ou inválidos no
+    array são reenviados em chamadas individuais. Lotes muito grandes
+    aumentam a latência de cada chamada; 8 é um bom ponto de partida.
+
+    Args:
+        caminhos_pdfs: Caminhos dos PDFs das ações previdenciárias.
+        contextos: Notas do advogado para cada PDF (mesma ordem), opcional.
+        batch_size: Quantidade máxima de PDFs por chamada à IA.
+
+    Returns:
+        Lista de dicionários no formato de `processar_acao_previdenciaria`,
+        na mesma ordem de `caminhos_pdfs`.
+
+    Raises:
+        FileNotFoundError: Se algum PDF não existir.
+        ValueError: Se `contextos` não tiver um item por PDF.
+    """
+    if contextos is None:
+        contextos = [""] * len(caminhos_pdfs)
+    
+    if len(contextos) != len(caminhos_pdfs):
+        raise ValueError("Informe um contexto adicional para cada PDF (ou nenhum).")
+    
+    # Valida todos os arquivos antes de qualquer chamada à IA
+    _, ausentes = _validar_lote(caminhos_pdfs)
+    if ausentes:
+        raise _erro_pdf_ausente(*ausentes)
+    
+    agent = inicializar_agente()
+    saida = sys.stdout
+    resultados = []
+    
+    for inicio in range(0, len(caminhos_pdfs), batch_size):
+        caminhos_lote = caminhos_pdfs[inicio:inicio + batch_size]
+        contextos_lote = contextos[inicio:inicio + batch_size]
+        limite = _LIMITE_CARACTERES_PDF // len(caminhos_lote)
+        
+        print(f"Lote com {len(caminhos_lote)} PDF(s): extraindo dados (GPT-4o-mini)", file=saida)
+        print(SEPARADOR_DUPLO, file=saida)
+        
+        # Instruções de lote só nesta mensagem: o prompt de sistema, comum às
+        # chamadas individuais, descreve a resposta de um único processo
+        partes = [
+            f"Extraia os dados previdenciários dos {len(caminhos_lote)} processos abaixo, "
+            "delimitados por `### CASO i ###`."
+        ]
+        for i, (caminho_pdf, contexto_adicional) in enumerate(zip(caminhos_lote, contextos_lote), 1):
+            caso = f"### CASO {i} ###\n{extrair_texto_pdf(caminho_pdf)[:limite]}"
+            if contexto_adicional:
+                caso += f"\n\nCONTEXTO ADICIONAL DO USUARIO:\n{contexto_adicional}"
+            partes.append(caso)
+        partes.append(
+            "Retorne APENAS um array JSON com um objeto no formato especificado para "
+            "cada caso, na mesma ordem em que aparecem, sem texto adicional."
+        )
+        
+        response = agent.run("\n\n".join(partes), stream=False)
+        
+        dados_lote = _interpretar_lote(response.content, len(caminhos_lote), saida)
+        
+        for caminho_pdf, contexto_adicional, dados_extraidos in zip(caminhos_lote, contextos_lote, dados_lote):
+            print(f"\nProcessando: {Path(caminho_pdf).name}", file=saida)
+            print(SEPARADOR_DUPLO, file=saida)
+            
+            if dados_extraidos is None:
+                # Caso perdido na resposta do lote: nova chamada só com este PDF
+                print("⚠ Caso sem extração válida no lote; reenviando individualmente.", file=saida)
+                consulta = _montar_consulta(extrair_texto_pdf(caminho_pdf), contexto_adicional)
+                response = agent.run(consulta, stream=False)
+                dados_extraidos = _interpretar_resposta(response.content, saida)
+            
+            resultados.append(_concluir_processamento(dados_extraidos, saida))
+    
+    return resultados
+
+
+@lru_cache(maxsize=1)
+def _cliente_openai() -> "OpenAI":
+    """Cliente OpenAI compartilhado pelas operações da Batch API."""
+    from openai import OpenAI
+    
+    return OpenAI()
+
+
+def submeter_lote_batch(
+    caminhos_pdfs: List[str],
+    contextos: Optional[List[str]] = None
+) -> str:
+    """
+    Submete a extração de vários PDFs à Batch API da OpenAI.
+
+    Indicado para execuções grandes e sem urgência (ex: processamento
+    noturno): o job conclui em até 24h, não consome o limite de requisições
+    por minuto e custa cerca de metade do modo síncrono. Cada PDF vira uma
+    requisição com as mesmas instruções do agente; o resultado é obtido
+    depois com `coletar_lote_batch`.
+
+    Args:
+        caminhos_pdfs: Caminhos dos PDFs das ações previdenciárias.
+        contextos: Notas do advogado para cada PDF (mesma ordem), opcional.
+
+    Returns:
+        Identificador do job criado na OpenAI.
+
+    Raises:
+        FileNotFoundError: Se algum PDF não existir.
+        ValueError: Se `contextos` não tiver um item por PDF.
+    """
+    if contextos is None:
+        contextos = [""] * len(caminhos_pdfs)
+    
+    if len(contextos) != len(caminhos_pdfs):
+        raise ValueError("Informe um contexto adicional para cada PDF (ou nenhum).")
+    
+    _, ausentes = _validar_lote(caminhos_pdfs)
+    if ausentes:
+        raise _erro_pdf_ausente(*ausentes)
+    
+    instrucoes = f"{_DESCRICAO_AGENTE}\n\n{montar_instrucoes()}"
+    linhas = []
+    
+    for i, (caminho_pdf, contexto_adicional) in enumerate(zip(caminhos_pdfs, contextos)):
+        consulta = _montar_consulta(extrair_texto_pdf(caminho_pdf), contexto_adicional)
+        
+        linhas.append(json.dumps({
+            # Índice no prefixo: mantém o id único mesmo com nomes repetidos
+            "custom_id": f"{i}:{Path(caminho_pdf).name}",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": _MODELO_IA,
+                "temperature": 0.1,
+                "messages": [
+                    {"role": "system", "content": instrucoes},
+                    {"role": "user", "content": consulta},
+                ],
+            },
+        }, ensure_ascii=False))
+    
+    cliente = _cliente_openai()
+    arquivo = cliente.files.create(
+        file=("lote_previdenciario.jsonl", "\n".join(linhas).encode("utf-8")),
+        purpose="batch"
+    )
+    job = cliente.batches.create(
+        input_file_id=arquivo.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    
+    return job.id
+
+
+def coletar_lote_batch(
+    job_id: str,
+    intervalo_consulta: float = 60.0
+) -> Dict[str, DadosPrevidenciarios]:
+    """
+    Aguarda a conclusão de um job da Batch API e interpreta as respostas.
+
+    Args:
+        job_id: Identificador retornado por `submeter_lote_batch`.
+        intervalo_consulta: Segundos entre as consultas ao estado do job.
+
+    Returns:
+        Dicionário `custom_id` → dados extraídos, na ordem de submissão.
+        Requisições com erro ou resposta inválida viram objetos vazios.
+
+    Raises:
+        RuntimeError: Se o job terminar sem sucesso (falha, expiração ou
+            cancelamento).
+    """
+    cliente = _cliente_openai()
+    job = cliente.batches.retrieve(job_id)
+    
+    while job.status not in _ESTADOS_FINAIS_BATCH:
+        time.sleep(intervalo_consulta)
+        job = cliente.batches.retrieve(job_id)
+    
+    if job.status != "completed" or not job.output_file_id:
+        raise RuntimeError(f"Job {job_id} da Batch API terminou com status '{job.status}'.")
+    
+    saida = sys.stdout
+    resultados = {}
+    
+    for linha in cliente.files.content(job.output_file_id).text.splitlines():
+        if not linha.strip():
+            continue
+        
+        registro = from_json(linha)
+        custom_id = registro["custom_id"]
+        resposta = registro.get("response") or {}
+        
+        print(f"\nResposta do lote: {custom_id}", file=saida)
+        
+        if resposta.get("status_code") == 200:
+            conteudo = resposta["body"]["choices"][0]["message"]["content"] or ""
+            resultados[custom_id] = _interpretar_resposta(conteudo, saida)
+        else:
+            print(f"✗ Requisição falhou: {registro.get('error') or resposta.get('status_code')}", file=saida)
+            resultados[custom_id] = DadosPrevidenciarios()
+    
+    # A Batch API não garante a ordem das linhas de saída
+    return dict(sorted(resultados.items(), key=lambda item: int(item[0].split(":", 1)[0])))
+
+
+async def _processar_pasta(caminhos: List[str]) -> None:
+    """Processa os PDFs de uma pasta em paralelo e resume as falhas ao final."""
+    falhas = []
+    
+    async for caminho, resultado in processar_muitos(caminhos):
+        if isinstance(resultado, BaseException):
+            falhas.append((caminho, resultado))
+    
+    for caminho, erro in falhas:
+        print(f"\n❌ {caminho}: {type(erro).__name__} - {erro}")
+    print(f"\n✅ Lote concluído: {len(caminhos) - len(falhas)} de {len(caminhos)} PDFs processados.")
+
+
 def main():
-    """Ponto de entrada principal do sistema previdenciário."""
+    """
+    Ponto de entrada principal do sistema previdenciário.
+
+    Aceita opcionalmente uma pasta de PDFs como argumento, processada com
+    chamadas paralelas à IA; sem argumento, roda o exemplo com notas simuladas.
+    """
     load_dotenv()
     
     if not os.getenv("OPENAI_API_KEY"):
@@ -596,10 +1174,17 @@ def main():
         return
     
     print("🏛️  JurisFlow - Sistema de Cálculo de Atrasados Previdenciários")
-    print("=" * 80)
+    print(SEPARADOR_DUPLO)
     
-    # Configuração de exemplo
-    caminho_pdf = str(raiz_projeto / "documentos" / "processo_previdenciario_exemplo.pdf")
+    if len(sys.argv) > 1 and Path(sys.argv[1]).is_dir():
+        caminhos = sorted(str(p) for p in Path(sys.argv[1]).glob("*.pdf"))
+        asyncio.run(_processar_pasta(caminhos))
+        return
+    
+    # Configuração de exemplo (ou PDF informado na linha de comando)
+    caminho_pdf = sys.argv[1] if len(sys.argv) > 1 else str(
+        raiz_projeto / "documentos" / "processo_previdenciario_exemplo.pdf"
+    )
     
     # Simula notas do advogado (contexto adicional)
     notas_usuario = """
@@ -618,7 +1203,7 @@ def main():
         # Resumo final
         if resultado['calculo'].get('status') == 'sucesso':
             total = resultado['calculo']['total_corrigido']
-            print(f"\n💰 VALOR TOTAL DOS ATRASADOS: R$ {total:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.'))
+            print(f"\n💰 VALOR TOTAL DOS ATRASADOS: {formatar_brl(total)}")
             
             if resultado.get('usar_salario_minimo_dinamico'):
                 print("\n📊 MÉTODO APLICADO: Salário Mínimo Dinâmico")
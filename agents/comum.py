@@ -0,0 +1,39 @@
+"""
+Utilitários compartilhados pelos agentes do JurisFlow.
+
+Reúne a limpeza das respostas da IA e a formatação dos relatórios, usadas
+tanto pelo agente trabalhista quanto pelo previdenciário.
+"""
+
+import re
+
+# Reexportado para os agentes: a implementação fica no núcleo
+from core.formatacao import formatar_brl
+
+
+# Padrões usados para isolar o JSON na resposta da IA (compilados uma única vez)
+_BLOCO_JSON_RE = re.compile(r"```(?:json)?\s*(\{.*\})\s*```", re.DOTALL)
+_CHAVES_JSON_RE = re.compile(r"(\{.*\})", re.DOTALL)
+
+# Separadores de seção dos relatórios
+SEPARADOR_DUPLO = "=" * 80
+SEPARADOR_SIMPLES = "-" * 80
+
+
+def limpar_json_da_resposta(resposta: str) -> str:
+    """
+    Remove markdown code blocks e texto extra da resposta da IA.
+    
+    Args:
+        resposta: Texto bruto retornado pela IA
+        
+    Returns:
+        String JSON limpa
+    """
+    # Bloco cercado por ``` (com ou sem "json"), ou o maior trecho entre { e }
+    correspondencia = _BLOCO_JSON_RE.search(resposta) or _CHAVES_JSON_RE.search(resposta)
+    
+    if correspondencia:
+        return correspondencia.group(1)
+    
+    return resposta.strip()
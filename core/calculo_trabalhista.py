@@ -5,14 +5,62 @@ Implementa regras da CLT para cálculo de verbas rescisórias sem uso de IA.
 Todos os cálculos são baseados em fórmulas matemáticas precisas.
 """
 
+import calendar
+import copy
 from datetime import date
-from typing import Dict, Any
-
-from dateutil.relativedelta import relativedelta
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 
 from models.schemas import DadosTrabalhistasExtraidos
 
 
+# Verbas tratadas por `calcular_rescisao` (as demais são apenas listadas nas observações)
+_VERBAS_CALCULAVEIS = frozenset({
+    "fgts",
+    "multa_40",
+    "aviso_previo",
+    "ferias_proporcionais",
+    "decimo_terceiro",
+    "saldo_salario",
+})
+
+
+def _somar_meses(data: date, meses: int) -> date:
+    """Soma meses a uma data, limitando o dia ao último dia do mês de destino."""
+    ano, indice_mes = divmod(data.year * 12 + data.month - 1 + meses, 12)
+    mes = indice_mes + 1
+    return date(ano, mes, min(data.day, calendar.monthrange(ano, mes)[1]))
+
+
+def _diferenca_anos_meses_dias(inicio: date, fim: date) -> Tuple[int, int, int]:
+    """
+    Calcula a diferença entre duas datas em anos, meses e dias.
+
+    Equivale a `relativedelta(fim, inicio)` (anos, meses e dias com o mesmo
+    sinal), usando apenas aritmética de inteiros sobre as datas.
+
+    Exemplo:
+        >>> _diferenca_anos_meses_dias(date(2020, 1, 31), date(2023, 3, 15))
+        (3, 1, 15)
+    """
+    meses = (fim.year - inicio.year) * 12 + fim.month - inicio.month
+    ancora = _somar_meses(inicio, meses)
+    
+    # Recua (ou avança, se fim < inicio) até a âncora não ultrapassar o fim
+    if fim >= inicio:
+        while ancora > fim:
+            meses -= 1
+            ancora = _somar_meses(inicio, meses)
+    else:
+        while ancora < fim:
+            meses += 1
+            ancora = _somar_meses(inicio, meses)
+    
+    anos, meses_restantes = divmod(abs(meses), 12)
+    sinal = -1 if meses < 0 else 1
+    return sinal * anos, sinal * meses_restantes, (fim - ancora).days
+
+
 def calcular_remuneracao_total(dados: DadosTrabalhistasExtraidos) -> float:
     """
     Calcula a remuneração total do trabalhador (salário base + adicionais).
@@ -31,25 +79,34 @@ def calcular_remuneracao_total(dados: DadosTrabalhistasExtraidos) -> float:
         >>> calcular_remuneracao_total(dados)
         2600.0
     """
-    remuneracao = dados.salario_base if dados.salario_base else 0.0
+    remuneracao = dados.salario_base or 0.0
+    adicionais = dados.adicionais
 
-    if dados.adicionais:
-        if dados.adicionais.insalubridade:
-            remuneracao += dados.adicionais.insalubridade
-        if dados.adicionais.periculosidade:
-            remuneracao += dados.adicionais.periculosidade
-        if dados.adicionais.noturno:
-            remuneracao += dados.adicionais.noturno
+    if adicionais is None:
+        return remuneracao
 
-    return remuneracao
+    return (
+        remuneracao
+        + (adicionais.insalubridade or 0.0)
+        + (adicionais.periculosidade or 0.0)
+        + (adicionais.noturno or 0.0)
+    )
 
 
-def calcular_rescisao(dados: DadosTrabalhistasExtraidos) -> Dict[str, Any]:
+def calcular_rescisao(
+    dados: DadosTrabalhistasExtraidos,
+    data_calculo: Optional[date] = None,
+    detalhado: bool = True
+) -> Dict[str, Any]:
     """
     Calcula valores estimados de verbas rescisórias trabalhistas.
 
     Args:
         dados: Objeto contendo dados extraídos da reclamação trabalhista.
+        data_calculo: Data registrada no resultado. Em lotes, informe a mesma
+            data para todos os casos; se omitida, usa a data de hoje.
+        detalhado: Se False, calcula apenas os valores: `memoria_calculo` e
+            `observacoes` voltam vazios (útil quando só os totais importam).
 
     Returns:
         Dicionário contendo:
@@ -94,150 +151,156 @@ def calcular_rescisao(dados: DadosTrabalhistasExtraidos) -> Dict[str, Any]:
             "total_geral": 0.0
         }
 
+    # Atributos usados em todo o cálculo, lidos uma única vez
+    salario_base = dados.salario_base
+    adicionais = dados.adicionais
+
     # Calcula remuneração total para base de cálculo
     remuneracao_total = calcular_remuneracao_total(dados)
 
     # Calcula tempo de serviço
-    delta = relativedelta(dados.data_dispensa, dados.data_admissao)
-    meses_trabalhados = (delta.years * 12) + delta.months
-    dias_extras = delta.days
+    anos, meses, dias_extras = _diferenca_anos_meses_dias(dados.data_admissao, dados.data_dispensa)
+    meses_trabalhados = (anos * 12) + meses
 
     # Ajusta meses considerando dias extras (proporcional)
     if dias_extras > 0:
         meses_trabalhados += dias_extras / 30.0
 
+    # Proporcional do último ano aquisitivo (base de férias e 13º), calculado uma vez
+    meses_ano_atual = meses_trabalhados % 12
+    proporcional_ano = salario_base / 12 * meses_ano_atual
+
+    # Conjunto das verbas pedidas: testes de pertinência em O(1)
+    verbas = frozenset(dados.verbas_requeridas)
+
     # Inicializa memória de cálculo
     memoria_calculo = {}
     observacoes = []
     total_estimado = 0.0
+    # Base da multa do Art. 467: aviso prévio + férias + 13º (sem FGTS e multa 40%)
+    verbas_incontroversas = 0.0
 
     # 1. FGTS (8% sobre salário base por mês trabalhado)
-    if "fgts" in dados.verbas_requeridas:
-        fgts_estimado = dados.salario_base * 0.08 * meses_trabalhados
-        memoria_calculo["fgts"] = {
-            "descricao": "FGTS acumulado estimado (8% × salário × meses)",
-            "formula": f"{dados.salario_base} × 0.08 × {meses_trabalhados:.2f}",
-            "valor": round(fgts_estimado, 2)
-        }
+    if "fgts" in verbas:
+        fgts_estimado = salario_base * 0.08 * meses_trabalhados
+        if detalhado:
+            memoria_calculo["fgts"] = {
+                "descricao": "FGTS acumulado estimado (8% × salário × meses)",
+                "formula": f"{salario_base} × 0.08 × {meses_trabalhados:.2f}",
+                "valor": round(fgts_estimado, 2)
+            }
         total_estimado += fgts_estimado
     else:
         fgts_estimado = 0.0
 
     # 2. Multa 40% sobre FGTS (rescisão sem justa causa)
-    if "multa_40" in dados.verbas_requeridas:
+    if "multa_40" in verbas:
         # Calcula sobre o FGTS estimado, mesmo que não esteja nas verbas
-        fgts_base = fgts_estimado if fgts_estimado > 0 else (dados.salario_base * 0.08 * meses_trabalhados)
+        fgts_base = fgts_estimado if fgts_estimado > 0 else (salario_base * 0.08 * meses_trabalhados)
         multa_40 = fgts_base * 0.40
-        memoria_calculo["multa_40_fgts"] = {
-            "descricao": "Multa de 40% sobre FGTS (demissão sem justa causa)",
-            "formula": f"{fgts_base:.2f} × 0.40",
-            "valor": round(multa_40, 2)
-        }
+        if detalhado:
+            memoria_calculo["multa_40_fgts"] = {
+                "descricao": "Multa de 40% sobre FGTS (demissão sem justa causa)",
+                "formula": f"{fgts_base:.2f} × 0.40",
+                "valor": round(multa_40, 2)
+            }
         total_estimado += multa_40
 
     # 3. Aviso Prévio (1 salário base)
-    if "aviso_previo" in dados.verbas_requeridas:
-        aviso_previo = dados.salario_base
-        memoria_calculo["aviso_previo"] = {
-            "descricao": "Aviso prévio indenizado (1 salário base)",
-            "formula": f"{dados.salario_base}",
-            "valor": round(aviso_previo, 2)
-        }
+    if "aviso_previo" in verbas:
+        aviso_previo = salario_base
+        if detalhado:
+            memoria_calculo["aviso_previo"] = {
+                "descricao": "Aviso prévio indenizado (1 salário base)",
+                "formula": f"{salario_base}",
+                "valor": round(aviso_previo, 2)
+            }
         total_estimado += aviso_previo
+        verbas_incontroversas += aviso_previo
 
     # 4. Férias Proporcionais (salário/12 × meses trabalhados no ano)
-    if "ferias_proporcionais" in dados.verbas_requeridas:
+    if "ferias_proporcionais" in verbas:
         # Simplificação: considera meses trabalhados no último ano aquisitivo
-        meses_ano_atual = min(meses_trabalhados % 12, 12)
-        ferias_proporcionais = (dados.salario_base / 12) * meses_ano_atual
-        ferias_com_terco = ferias_proporcionais * 1.333  # + 1/3 constitucional
-        memoria_calculo["ferias_proporcionais"] = {
-            "descricao": "Férias proporcionais + 1/3 constitucional",
-            "formula": f"({dados.salario_base} / 12 × {meses_ano_atual:.2f}) × 1.333",
-            "valor": round(ferias_com_terco, 2)
-        }
+        ferias_com_terco = proporcional_ano * (4 / 3)  # + 1/3 constitucional
+        if detalhado:
+            memoria_calculo["ferias_proporcionais"] = {
+                "descricao": "Férias proporcionais + 1/3 constitucional",
+                "formula": f"({salario_base} / 12 × {meses_ano_atual:.2f}) × 4/3",
+                "valor": round(ferias_com_terco, 2)
+            }
         total_estimado += ferias_com_terco
+        verbas_incontroversas += ferias_com_terco
 
     # 5. 13º Salário Proporcional
-    if "decimo_terceiro" in dados.verbas_requeridas:
-        meses_ano_atual = min(meses_trabalhados % 12, 12)
-        decimo_terceiro = (dados.salario_base / 12) * meses_ano_atual
-        memoria_calculo["decimo_terceiro"] = {
-            "descricao": "13º salário proporcional",
-            "formula": f"{dados.salario_base} / 12 × {meses_ano_atual:.2f}",
-            "valor": round(decimo_terceiro, 2)
-        }
+    if "decimo_terceiro" in verbas:
+        decimo_terceiro = proporcional_ano
+        if detalhado:
+            memoria_calculo["decimo_terceiro"] = {
+                "descricao": "13º salário proporcional",
+                "formula": f"{salario_base} / 12 × {meses_ano_atual:.2f}",
+                "valor": round(decimo_terceiro, 2)
+            }
         total_estimado += decimo_terceiro
+        verbas_incontroversas += decimo_terceiro
 
     # 6. MULTA DO ART. 477 CLT (Atraso no pagamento das verbas rescisórias)
     multa_477_valor = 0.0
     if dados.multa_477_requerida:
         multa_477_valor = remuneracao_total
-        memoria_calculo["multa_477_clt"] = {
-            "descricao": "Multa do Art. 477 CLT (atraso no pagamento - 1 remuneração)",
-            "formula": f"Salário base ({dados.salario_base}) + Adicionais = {remuneracao_total}",
-            "valor": round(multa_477_valor, 2)
-        }
-        observacoes.append("Multa do Art. 477 aplicada: atraso no pagamento das verbas rescisórias.")
+        if detalhado:
+            memoria_calculo["multa_477_clt"] = {
+                "descricao": "Multa do Art. 477 CLT (atraso no pagamento - 1 remuneração)",
+                "formula": f"Salário base ({salario_base}) + Adicionais = {remuneracao_total}",
+                "valor": round(multa_477_valor, 2)
+            }
+            observacoes.append("Multa do Art. 477 aplicada: atraso no pagamento das verbas rescisórias.")
 
     # 7. MULTA DO ART. 467 CLT (Verbas incontroversas - 50% sobre verbas não pagas)
     multa_467_valor = 0.0
     if dados.multa_467_requerida:
-        # Identifica verbas rescisórias calculadas (base para a multa de 50%)
-        verbas_incontroversas = 0.0
-
-        # Soma apenas verbas rescisórias típicas (não inclui FGTS e multa 40%)
-        if "aviso_previo" in memoria_calculo:
-            verbas_incontroversas += memoria_calculo["aviso_previo"]["valor"]
-
-        if "ferias_proporcionais" in memoria_calculo:
-            verbas_incontroversas += memoria_calculo["ferias_proporcionais"]["valor"]
-
-        if "decimo_terceiro" in memoria_calculo:
-            verbas_incontroversas += memoria_calculo["decimo_terceiro"]["valor"]
-
-        # Aplica 50% sobre as verbas incontroversas
+        # Aplica 50% sobre as verbas incontroversas (somadas sem arredondamento)
         multa_467_valor = verbas_incontroversas * 0.50
 
-        memoria_calculo["multa_467_clt"] = {
-            "descricao": "Multa do Art. 467 CLT (50% sobre verbas incontroversas)",
-            "formula": f"(Aviso Prévio + Férias + 13º) × 0.50 = {verbas_incontroversas:.2f} × 0.50",
-            "valor": round(multa_467_valor, 2)
-        }
-        observacoes.append("Multa do Art. 467 aplicada: 50% sobre verbas incontroversas não pagas.")
+        if detalhado:
+            memoria_calculo["multa_467_clt"] = {
+                "descricao": "Multa do Art. 467 CLT (50% sobre verbas incontroversas)",
+                "formula": f"(Aviso Prévio + Férias + 13º) × 0.50 = {verbas_incontroversas:.2f} × 0.50",
+                "valor": round(multa_467_valor, 2)
+            }
+            observacoes.append("Multa do Art. 467 aplicada: 50% sobre verbas incontroversas não pagas.")
 
     # TOTAL GERAL (Verbas + Multas CLT)
     total_geral = total_estimado + multa_477_valor + multa_467_valor
 
-    # Adiciona observações relevantes
-    if meses_trabalhados < 1:
-        observacoes.append("Atenção: Tempo de serviço inferior a 1 mês. Alguns cálculos podem ser proporcionais.")
+    # Adiciona observações relevantes (apenas no modo detalhado)
+    if detalhado:
+        if meses_trabalhados < 1:
+            observacoes.append("Atenção: Tempo de serviço inferior a 1 mês. Alguns cálculos podem ser proporcionais.")
 
-    if dados.adicionais and (dados.adicionais.insalubridade or dados.adicionais.periculosidade or dados.adicionais.noturno):
-        observacoes.append(
-            f"Remuneração total considerada (salário + adicionais): R$ {remuneracao_total:.2f}"
-        )
+        if adicionais and (adicionais.insalubridade or adicionais.periculosidade or adicionais.noturno):
+            observacoes.append(
+                f"Remuneração total considerada (salário + adicionais): R$ {remuneracao_total:.2f}"
+            )
 
-    if dados.justificativa_demissao and "justa causa" in dados.justificativa_demissao.lower():
-        observacoes.append("ALERTA: Em demissão por justa causa, várias verbas rescisórias NÃO são devidas.")
+        if dados.justificativa_demissao and "justa causa" in dados.justificativa_demissao.lower():
+            observacoes.append("ALERTA: Em demissão por justa causa, várias verbas rescisórias NÃO são devidas.")
 
-    # Adiciona informações sobre verbas não calculadas
-    verbas_calculadas_keys = [k for k in memoria_calculo.keys() if not k.startswith("multa_")]
-    verbas_nao_calculadas = [v for v in dados.verbas_requeridas if v not in ["fgts", "multa_40", "aviso_previo", "ferias_proporcionais", "decimo_terceiro", "saldo_salario"]]
+        # Adiciona informações sobre verbas não calculadas
+        verbas_nao_calculadas = [v for v in dados.verbas_requeridas if v not in _VERBAS_CALCULAVEIS]
 
-    if verbas_nao_calculadas:
-        observacoes.append(f"Verbas requeridas não calculadas automaticamente: {', '.join(verbas_nao_calculadas)}")
+        if verbas_nao_calculadas:
+            observacoes.append(f"Verbas requeridas não calculadas automaticamente: {', '.join(verbas_nao_calculadas)}")
 
     # Monta resultado final
     return {
         "status": "sucesso",
         "tempo_servico": {
-            "anos": delta.years,
-            "meses": delta.months,
-            "dias": delta.days,
+            "anos": anos,
+            "meses": meses,
+            "dias": dias_extras,
             "meses_totais": round(meses_trabalhados, 2)
         },
-        "salario_base": dados.salario_base,
+        "salario_base": salario_base,
         "remuneracao_base_calculo": round(remuneracao_total, 2),
         "memoria_calculo": memoria_calculo,
         "total_estimado": round(total_estimado, 2),
@@ -246,5 +309,34 @@ def calcular_rescisao(dados: DadosTrabalhistasExtraidos) -> Dict[str, Any]:
         "total_geral": round(total_geral, 2),
         "observacoes": observacoes,
         "verbas_requeridas": dados.verbas_requeridas,
-        "data_calculo": date.today().isoformat()
-    }
\ No newline at end of file
+        "data_calculo": (data_calculo or date.today()).isoformat()
+    }
+
+
+@lru_cache(maxsize=1024)
+def _calcular_rescisao_por_chave(dados_json: str, data_calculo: date) -> Dict[str, Any]:
+    """
+    Executa `calcular_rescisao` para dados serializados (chave do cache).
+
+    A data do cálculo faz parte da chave para que `data_calculo` no resultado
+    nunca fique desatualizada.
+    """
+    return calcular_rescisao(DadosTrabalhistasExtraidos.model_validate_json(dados_json), data_calculo)
+
+
+def calcular_rescisao_memoizado(dados: DadosTrabalhistasExtraidos) -> Dict[str, Any]:
+    """
+    Versão memoizada de `calcular_rescisao` para dados repetidos.
+
+    O cálculo é determinístico, então dados idênticos (ex: o mesmo processo
+    reprocessado) reaproveitam o resultado anterior.
+
+    Args:
+        dados: Objeto contendo dados extraídos da reclamação trabalhista.
+
+    Returns:
+        Cópia independente do dicionário retornado por `calcular_rescisao`,
+        que pode ser alterada pelo chamador sem afetar o cache.
+    """
+    resultado = _calcular_rescisao_por_chave(dados.model_dump_json(), date.today())
+    return copy.deepcopy(resultado)
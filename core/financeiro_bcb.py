@@ -11,14 +11,33 @@ ATENÇÃO JURÍDICA:
 - Salário Mínimo Dinâmico: Quando ativado, aplica os reajustes oficiais mês a mês.
 """
 
-from datetime import date
-from typing import Dict, Any, List
-from dateutil.relativedelta import relativedelta
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+import math
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Any, List, Optional, Sequence, Tuple
 from bcb import sgs
+import pandas as pd
 import warnings
 
 from core.lookup_data import obter_salario_minimo
 
+if TYPE_CHECKING:
+    from tools.cache_series import CacheSeriesSGS
+
+
+# Threads para buscar as taxas no BCB enquanto as parcelas são montadas
+_POOL_BUSCAS = ThreadPoolExecutor(max_workers=4, thread_name_prefix="bcb")
+
+# Séries mantidas em memória por gerente (as menos usadas saem primeiro)
+_MAX_SERIES_EM_MEMORIA = 128
+
+# Séries que chegam ao mês corrente (ponto ainda não publicado ou parcial) são
+# reaproveitadas por no máximo 1 hora; as de meses encerrados não expiram
+_VALIDADE_SERIE_MES_CORRENTE = 3600.0
+
 
 class GerenteFinanceiroBCB:
     """
@@ -33,9 +52,155 @@ class GerenteFinanceiroBCB:
     CODIGO_INPC_MENSAL = 188    # INPC mensal
     CODIGO_IPCA_E_MENSAL = 433  # IPCA-E mensal
     
-    def __init__(self):
-        """Inicializa o gerente financeiro."""
-        self.cache_taxas: Dict[str, Any] = {}
+    # Taxas SELIC mensais estimadas (%) usadas quando a API do BCB falha
+    TAXA_FALLBACK_ATE_2023 = 1.08
+    TAXA_FALLBACK_2024 = 0.92
+    TAXA_FALLBACK_A_PARTIR_2025 = 0.90
+    
+    def __init__(self, cache_series: Optional["CacheSeriesSGS"] = None):
+        """
+        Inicializa o gerente financeiro.
+        
+        Args:
+            cache_series: Cache em disco das séries do SGS. Se informado, apenas
+                          os meses ainda não armazenados são buscados na API.
+        """
+        # Séries já baixadas do SGS, por (nome, código, início, fim), com o
+        # instante (time.monotonic) em que expiram; em ordem de uso (LRU)
+        self.cache_taxas: "OrderedDict[Tuple[str, int, date, date], Tuple[Any, float]]" = OrderedDict()
+        self._trava_cache_taxas = threading.Lock()
+        self.cache_series = cache_series
+        
+        # Busca das taxas mensais por índice de correção (nome em maiúsculas)
+        self._buscas_taxas_mensais: Dict[str, Callable[[date, date], Dict[str, float]]] = {
+            "SELIC": self.get_taxas_selic_mensais,
+            "INPC": self.get_taxas_inpc_mensais,
+            "IPCA-E": self.get_taxas_ipca_e_mensais,
+        }
+    
+    def _buscar_serie(self, nome: str, codigo: int, data_inicio: date, data_fim: date) -> Any:
+        """
+        Busca uma série temporal no SGS, reaproveitando consultas já feitas.
+        
+        Apenas respostas com dados são guardadas: uma falha ou série vazia é
+        consultada novamente na próxima chamada. A memória guarda no máximo
+        `_MAX_SERIES_EM_MEMORIA` séries, e as que chegam ao mês corrente expiram
+        após `_VALIDADE_SERIE_MES_CORRENTE` segundos.
+        
+        Args:
+            nome: Nome da coluna no DataFrame retornado.
+            codigo: Código da série no SGS.
+            data_inicio: Data inicial do período.
+            data_fim: Data final do período.
+        
+        Returns:
+            DataFrame retornado por `sgs.get` (pode ser None ou vazio).
+        """
+        chave = (nome, codigo, data_inicio, data_fim)
+        
+        with self._trava_cache_taxas:
+            registro = self.cache_taxas.get(chave)
+            if registro is not None and registro[1] > time.monotonic():
+                self.cache_taxas.move_to_end(chave)
+                return registro[0]
+        
+        if self.cache_series is None:
+            serie = sgs.get({nome: codigo}, start=data_inicio, end=data_fim)
+        else:
+            serie = self._buscar_serie_persistida(nome, codigo, data_inicio, data_fim)
+        
+        if serie is not None and not serie.empty:
+            if data_fim >= date.today().replace(day=1):
+                expira_em = time.monotonic() + _VALIDADE_SERIE_MES_CORRENTE
+            else:
+                expira_em = math.inf
+            
+            with self._trava_cache_taxas:
+                self.cache_taxas[chave] = (serie, expira_em)
+                self.cache_taxas.move_to_end(chave)
+                while len(self.cache_taxas) > _MAX_SERIES_EM_MEMORIA:
+                    self.cache_taxas.popitem(last=False)
+        
+        return serie
+    
+    def _buscar_serie_persistida(
+        self,
+        nome: str,
+        codigo: int,
+        data_inicio: date,
+        data_fim: date
+    ) -> pd.DataFrame:
+        """
+        Busca uma série usando o cache em disco, baixando só o que falta.
+        
+        Confere, mês a mês, quais competências do período já estão armazenadas
+        e busca na API apenas os trechos contínuos que faltam (inclusive lacunas
+        no meio do período e o mês corrente, que nunca é armazenado). Conferência,
+        busca e gravação acontecem sob a trava do cache, pois o gerente é
+        compartilhado entre threads.
+        
+        Uma falha na busca de um trecho que começa no mês anterior ou no mês
+        corrente (pontos possivelmente ainda não publicados) é tolerada; qualquer
+        outra falha é propagada para que o chamador use o fallback, em vez de
+        calcular com meses faltando.
+        
+        Args:
+            nome: Nome da coluna no DataFrame retornado.
+            codigo: Código da série no SGS.
+            data_inicio: Data inicial do período.
+            data_fim: Data final do período.
+        
+        Returns:
+            DataFrame no mesmo formato de `sgs.get` (índice de datas, coluna `nome`).
+        """
+        # Pontos do SGS são datados no dia 1: meses contados como ano * 12 + (mes - 1)
+        primeiro_mes = data_inicio.year * 12 + data_inicio.month - 1 + (1 if data_inicio.day > 1 else 0)
+        ultimo_mes = data_fim.year * 12 + data_fim.month - 1
+        hoje = date.today()
+        mes_anterior = hoje.year * 12 + hoje.month - 2
+        
+        with self.cache_series.trava:
+            pontos = dict(self.cache_series.obter(codigo, data_inicio, data_fim))
+            meses_armazenados = {data.year * 12 + data.month - 1 for data in pontos}
+            
+            # Agrupa os meses faltantes em trechos contínuos [inicio, fim]
+            trechos: List[List[int]] = []
+            for indice_mes in range(primeiro_mes, ultimo_mes + 1):
+                if indice_mes in meses_armazenados:
+                    continue
+                if trechos and trechos[-1][1] == indice_mes - 1:
+                    trechos[-1][1] = indice_mes
+                else:
+                    trechos.append([indice_mes, indice_mes])
+            
+            for inicio_trecho, fim_trecho in trechos:
+                ano, mes = divmod(inicio_trecho, 12)
+                inicio_busca = max(data_inicio, date(ano, mes + 1, 1))
+                ano, mes = divmod(fim_trecho + 1, 12)
+                fim_busca = min(data_fim, date(ano, mes + 1, 1) - timedelta(days=1))
+                
+                try:
+                    df_novo = sgs.get({nome: codigo}, start=inicio_busca, end=fim_busca)
+                except Exception:
+                    if inicio_trecho < mes_anterior:
+                        raise
+                    # Meses recentes ainda não publicados: usa apenas o que está em disco
+                    continue
+                
+                if df_novo is not None and not df_novo.empty:
+                    novos = list(zip(df_novo.index.date, df_novo[nome].astype(float).tolist()))
+                    self.cache_series.salvar(codigo, novos)
+                    # O mês corrente não é armazenado: vem apenas da busca recém-feita
+                    pontos.update(
+                        (data, valor) for data, valor in novos if data_inicio <= data <= data_fim
+                    )
+        
+        datas = sorted(pontos)
+        
+        return pd.DataFrame(
+            {nome: [pontos[data] for data in datas]},
+            index=pd.DatetimeIndex(datas, name="Date")
+        )
     
     def get_selic_acumulada(self, data_inicio: date, data_fim: date) -> float:
         """
@@ -56,11 +221,7 @@ class GerenteFinanceiroBCB:
         """
         try:
             # Busca a série temporal da SELIC no BCB
-            df_selic = sgs.get(
-                {'selic': self.CODIGO_SELIC_MENSAL},
-                start=data_inicio,
-                end=data_fim
-            )
+            df_selic = self._buscar_serie('selic', self.CODIGO_SELIC_MENSAL, data_inicio, data_fim)
             
             if df_selic is None or df_selic.empty:
                 warnings.warn(
@@ -71,10 +232,7 @@ class GerenteFinanceiroBCB:
             
             # Calcula a taxa acumulada usando fórmula: (1 + r1/100) * (1 + r2/100) * ... - 1
             # As taxas do BCB vêm em percentual (ex: 1.25 = 1,25%)
-            taxas_mensais = df_selic['selic'] / 100  # Converte para decimal
-            taxa_acumulada = (1 + taxas_mensais).prod() - 1
-            
-            return float(taxa_acumulada)
+            return self._acumular_taxas(df_selic['selic'].tolist())
         
         except Exception as e:
             warnings.warn(
@@ -101,11 +259,7 @@ class GerenteFinanceiroBCB:
         """
         try:
             # Busca a série temporal da SELIC no BCB
-            df_selic = sgs.get(
-                {'selic': self.CODIGO_SELIC_MENSAL},
-                start=data_inicio,
-                end=data_fim
-            )
+            df_selic = self._buscar_serie('selic', self.CODIGO_SELIC_MENSAL, data_inicio, data_fim)
             
             if df_selic is None or df_selic.empty:
                 warnings.warn(
@@ -114,14 +268,12 @@ class GerenteFinanceiroBCB:
                 )
                 return self._taxas_mensais_fallback(data_inicio, data_fim)
             
-            # Converte DataFrame em dicionário {competência: taxa}
-            taxas_dict = {}
-            for index, row in df_selic.iterrows():
-                competencia = index.strftime("%m/%Y")
-                taxa_percentual = row['selic']  # Já em percentual (ex: 1.16)
-                taxas_dict[competencia] = float(taxa_percentual)
+            # Converte DataFrame em dicionário {competência: taxa}, coluna a coluna
+            # (taxas já em percentual, ex: 1.16)
+            competencias = df_selic.index.strftime("%m/%Y").tolist()
+            taxas = df_selic['selic'].astype(float).tolist()
             
-            return taxas_dict
+            return dict(zip(competencias, taxas))
         
         except Exception as e:
             warnings.warn(
@@ -130,6 +282,36 @@ class GerenteFinanceiroBCB:
             )
             return self._taxas_mensais_fallback(data_inicio, data_fim)
     
+    def get_taxas_inpc_mensais(self, data_inicio: date, data_fim: date) -> Dict[str, float]:
+        """
+        Busca as taxas do INPC mês a mês.
+        
+        Args:
+            data_inicio: Data inicial do período.
+            data_fim: Data final do período.
+        
+        Returns:
+            Dicionário {competência_str: taxa_percentual} (por enquanto, da SELIC).
+        """
+        # TODO: Implementar busca mensal do INPC
+        warnings.warn("Cálculo mensal do INPC ainda não implementado. Usando SELIC.")
+        return self.get_taxas_selic_mensais(data_inicio, data_fim)
+    
+    def get_taxas_ipca_e_mensais(self, data_inicio: date, data_fim: date) -> Dict[str, float]:
+        """
+        Busca as taxas do IPCA-E mês a mês.
+        
+        Args:
+            data_inicio: Data inicial do período.
+            data_fim: Data final do período.
+        
+        Returns:
+            Dicionário {competência_str: taxa_percentual} (por enquanto, da SELIC).
+        """
+        # TODO: Implementar busca mensal do IPCA-E
+        warnings.warn("Cálculo mensal do IPCA-E ainda não implementado. Usando SELIC.")
+        return self.get_taxas_selic_mensais(data_inicio, data_fim)
+    
     def _taxas_mensais_fallback(self, data_inicio: date, data_fim: date) -> Dict[str, float]:
         """
         Retorna taxas SELIC mensais estimadas quando a API do BCB falhar.
@@ -144,26 +326,23 @@ class GerenteFinanceiroBCB:
             Dicionário {competência: taxa_percentual}
         """
         taxas_dict = {}
-        data_atual = data_inicio.replace(day=1)  # Primeiro dia do mês
         
         # Taxa mensal média aproximada (baseada em período 2023-2024)
         # 2023: ~1.08% a.m. | 2024: ~0.92% a.m.
-        while data_atual <= data_fim:
-            ano = data_atual.year
+        # Meses percorridos como ano * 12 + (mes - 1), do mês de data_inicio ao de data_fim
+        for indice_mes in range(data_inicio.year * 12 + data_inicio.month - 1,
+                                data_fim.year * 12 + data_fim.month):
+            ano, mes = divmod(indice_mes, 12)
             
             # Ajusta taxa por ano (histórico aproximado)
             if ano <= 2023:
-                taxa_mensal = 1.08  # 1,08% ao mês
+                taxa_mensal = self.TAXA_FALLBACK_ATE_2023  # 1,08% ao mês
             elif ano == 2024:
-                taxa_mensal = 0.92  # 0,92% ao mês
+                taxa_mensal = self.TAXA_FALLBACK_2024  # 0,92% ao mês
             else:
-                taxa_mensal = 0.90  # 0,90% ao mês (estimativa conservadora)
+                taxa_mensal = self.TAXA_FALLBACK_A_PARTIR_2025  # 0,90% ao mês (estimativa conservadora)
             
-            competencia = data_atual.strftime("%m/%Y")
-            taxas_dict[competencia] = taxa_mensal
-            
-            # Avança para o próximo mês
-            data_atual = data_atual + relativedelta(months=1)
+            taxas_dict[f"{mes + 1:02d}/{ano}"] = taxa_mensal
         
         return taxas_dict
     
@@ -178,13 +357,70 @@ class GerenteFinanceiroBCB:
         Returns:
             Taxa acumulada estimada (aproximação para MVP).
         """
-        taxas_mensais = self._taxas_mensais_fallback(data_inicio, data_fim)
+        indice_inicio = data_inicio.year * 12 + data_inicio.month - 1
+        indice_fim = data_fim.year * 12 + data_fim.month - 1
+        
+        # Meses do período em cada faixa da tabela de `_taxas_mensais_fallback`
+        meses_ate_2023 = max(0, min(indice_fim, 2023 * 12 + 11) - indice_inicio + 1)
+        meses_2024 = max(0, min(indice_fim, 2024 * 12 + 11) - max(indice_inicio, 2024 * 12) + 1)
+        meses_a_partir_2025 = max(0, indice_fim - max(indice_inicio, 2025 * 12) + 1)
+        
+        return self._acumular_faixas([
+            (meses_ate_2023, self.TAXA_FALLBACK_ATE_2023 / 100),
+            (meses_2024, self.TAXA_FALLBACK_2024 / 100),
+            (meses_a_partir_2025, self.TAXA_FALLBACK_A_PARTIR_2025 / 100),
+        ])
+    
+    @staticmethod
+    def _contar_meses(data_inicio: date, data_fim: date) -> int:
+        """
+        Conta os meses entre duas datas, arredondando o mês parcial para cima.
         
-        # Acumula juros compostos
-        fator = 1.0
-        for taxa_percentual in taxas_mensais.values():
-            fator *= (1 + taxa_percentual / 100)
+        Equivale aos meses completos de `relativedelta(data_fim, data_inicio)`
+        mais 1 se sobrarem dias, sem construir o objeto relativedelta.
+        
+        Args:
+            data_inicio: Data inicial do período.
+            data_fim: Data final do período.
+        
+        Returns:
+            Quantidade de meses (parciais contam como inteiros).
+        """
+        meses = (data_fim.year - data_inicio.year) * 12 + data_fim.month - data_inicio.month
+        if data_fim.day > data_inicio.day:
+            meses += 1
+        return meses
+    
+    @staticmethod
+    def _acumular_taxas(taxas_percentuais: List[float]) -> float:
+        """
+        Acumula juros compostos de uma sequência de taxas mensais.
+        
+        Multiplica os floats diretamente: para as poucas dezenas de meses de um
+        cálculo, criar Series intermediárias do pandas custa mais que a conta.
+        
+        Args:
+            taxas_percentuais: Taxas mensais em percentual (ex: 1.25 = 1,25%).
+        
+        Returns:
+            Taxa acumulada no período (em decimal).
+        """
+        return math.prod(1 + taxa / 100 for taxa in taxas_percentuais) - 1
+    
+    @staticmethod
+    def _acumular_faixas(faixas: List[Tuple[int, float]]) -> float:
+        """
+        Acumula juros compostos de faixas com taxa mensal constante.
+        
+        Args:
+            faixas: Lista de (quantidade_meses, taxa_mensal_decimal).
         
+        Returns:
+            Taxa acumulada no período (em decimal).
+        """
+        fator = 1.0
+        for meses, taxa_mensal in faixas:
+            fator *= (1 + taxa_mensal) ** meses
         return fator - 1
     
     def get_inpc_acumulado(self, data_inicio: date, data_fim: date) -> float:
@@ -199,20 +435,13 @@ class GerenteFinanceiroBCB:
             Índice INPC acumulado (em decimal, ex: 0.0523 = 5,23%).
         """
         try:
-            df_inpc = sgs.get(
-                {'inpc': self.CODIGO_INPC_MENSAL},
-                start=data_inicio,
-                end=data_fim
-            )
+            df_inpc = self._buscar_serie('inpc', self.CODIGO_INPC_MENSAL, data_inicio, data_fim)
             
             if df_inpc is None or df_inpc.empty:
                 return self._taxa_fallback_inpc(data_inicio, data_fim)
             
             # Acumula os índices mensais
-            taxas_mensais = df_inpc['inpc'] / 100
-            indice_acumulado = (1 + taxas_mensais).prod() - 1
-            
-            return float(indice_acumulado)
+            return self._acumular_taxas(df_inpc['inpc'].tolist())
         
         except Exception as e:
             warnings.warn(f"Erro ao buscar INPC: {e}. Usando fallback.")
@@ -220,10 +449,9 @@ class GerenteFinanceiroBCB:
     
     def _taxa_fallback_inpc(self, data_inicio: date, data_fim: date) -> float:
         """Fallback do INPC (média ~0,4% a.m. em 2023-2024)."""
-        delta = relativedelta(data_fim, data_inicio)
-        meses = (delta.years * 12) + delta.months + (1 if delta.days > 0 else 0)
+        meses = self._contar_meses(data_inicio, data_fim)
         taxa_mensal_media = 0.004  # 0,4% ao mês
-        return (1 + taxa_mensal_media) ** meses - 1
+        return self._acumular_faixas([(meses, taxa_mensal_media)])
     
     def get_ipca_e_acumulado(self, data_inicio: date, data_fim: date) -> float:
         """
@@ -237,19 +465,12 @@ class GerenteFinanceiroBCB:
             Índice IPCA-E acumulado (em decimal).
         """
         try:
-            df_ipca_e = sgs.get(
-                {'ipca_e': self.CODIGO_IPCA_E_MENSAL},
-                start=data_inicio,
-                end=data_fim
-            )
+            df_ipca_e = self._buscar_serie('ipca_e', self.CODIGO_IPCA_E_MENSAL, data_inicio, data_fim)
             
             if df_ipca_e is None or df_ipca_e.empty:
                 return self._taxa_fallback_ipca_e(data_inicio, data_fim)
             
-            taxas_mensais = df_ipca_e['ipca_e'] / 100
-            indice_acumulado = (1 + taxas_mensais).prod() - 1
-            
-            return float(indice_acumulado)
+            return self._acumular_taxas(df_ipca_e['ipca_e'].tolist())
         
         except Exception as e:
             warnings.warn(f"Erro ao buscar IPCA-E: {e}. Usando fallback.")
@@ -257,10 +478,61 @@ class GerenteFinanceiroBCB:
     
     def _taxa_fallback_ipca_e(self, data_inicio: date, data_fim: date) -> float:
         """Fallback do IPCA-E (média ~0,42% a.m. em 2023-2024)."""
-        delta = relativedelta(data_fim, data_inicio)
-        meses = (delta.years * 12) + delta.months + (1 if delta.days > 0 else 0)
+        meses = self._contar_meses(data_inicio, data_fim)
         taxa_mensal_media = 0.0042  # 0,42% ao mês
-        return (1 + taxa_mensal_media) ** meses - 1
+        return self._acumular_faixas([(meses, taxa_mensal_media)])
+    
+    def precomputar_fatores(
+        self,
+        data_inicio: date,
+        data_fim: date,
+        indice: str = "SELIC"
+    ) -> Tuple[float, ...]:
+        """
+        Calcula os fatores de correção acumulados de cada mês do período.
+        
+        Os fatores dependem apenas do período e do índice, não da RMI: podem ser
+        calculados uma vez e repassados a `calcular_atrasados` em lote (ex: ações
+        coletivas, simulações com várias RMIs).
+        
+        Args:
+            data_inicio: DIB - Data de Início do Benefício.
+            data_fim: Data final do cálculo.
+            indice: Índice de correção: "SELIC", "INPC" ou "IPCA-E".
+        
+        Returns:
+            Tupla em que o i-ésimo elemento é o produto de (1 + taxa/100) do
+            i-ésimo mês do período até o mês de data_fim (o último elemento é 1.0).
+        
+        Raises:
+            ValueError: Se o índice não for suportado.
+        
+        Exemplo:
+            >>> gerente = GerenteFinanceiroBCB()
+            >>> fatores = gerente.precomputar_fatores(date(2023, 1, 1), date(2024, 1, 1))
+            >>> resultados = [
+            ...     gerente.calcular_atrasados(rmi, date(2023, 1, 1), date(2024, 1, 1), fatores=fatores)
+            ...     for rmi in (1500.0, 2000.0, 2500.0)
+            ... ]
+        """
+        buscar_taxas_mensais = self._buscas_taxas_mensais.get(indice.upper())
+        if buscar_taxas_mensais is None:
+            raise ValueError(f"Índice '{indice}' não suportado. Use SELIC, INPC ou IPCA-E.")
+        
+        taxas_mensais = buscar_taxas_mensais(data_inicio, data_fim)
+        
+        # Acumula do último mês para o primeiro (meses contados como ano * 12 + (mes - 1))
+        indice_inicio = data_inicio.year * 12 + data_inicio.month - 1
+        quantidade_meses = data_fim.year * 12 + data_fim.month - indice_inicio
+        fatores = [1.0] * (quantidade_meses + 1)
+        
+        for i in range(quantidade_meses - 1, -1, -1):
+            ano, indice_mes = divmod(indice_inicio + i, 12)
+            # Busca taxa do mês (se não existir, usa 0)
+            taxa_mes = taxas_mensais.get(f"{indice_mes + 1:02d}/{ano}", 0.0)
+            fatores[i] = fatores[i + 1] * (1 + taxa_mes / 100)
+        
+        return tuple(fatores)
     
     def calcular_atrasados(
         self,
@@ -269,7 +541,9 @@ class GerenteFinanceiroBCB:
         data_fim: date,
         indice: str = "SELIC",
         tem_adicional_25: bool = False,
-        usar_salario_minimo_dinamico: bool = False
+        usar_salario_minimo_dinamico: bool = False,
+        detalhado: bool = True,
+        fatores: Optional[Sequence[float]] = None
     ) -> Dict[str, Any]:
         """
         Calcula o valor total de atrasados previdenciários com correção monetária CORRETA.
@@ -291,6 +565,11 @@ class GerenteFinanceiroBCB:
             tem_adicional_25: Se aplica adicional de 25% (grande invalidez).
             usar_salario_minimo_dinamico: Se True, usa o salário mínimo vigente em cada mês
                                           (útil para benefícios de 1 salário mínimo).
+            detalhado: Se False, calcula apenas os totais: `memoria_mensal` e
+                       `observacoes` voltam vazias (útil para resumos e simulações).
+            fatores: Fatores já calculados por `precomputar_fatores` para o mesmo
+                     período e índice. Evita buscar as taxas e acumulá-las de novo
+                     ao calcular várias RMIs para o mesmo período.
         
         Returns:
             Dicionário contendo:
@@ -340,44 +619,43 @@ class GerenteFinanceiroBCB:
         
         # Busca taxas mensais de acordo com o índice escolhido
         # (Por enquanto, só SELIC está implementado corretamente)
-        if indice.upper() == "SELIC":
-            taxas_mensais = self.get_taxas_selic_mensais(data_inicio, data_fim)
-        elif indice.upper() == "INPC":
-            # TODO: Implementar busca mensal do INPC
-            warnings.warn("Cálculo mensal do INPC ainda não implementado. Usando SELIC.")
-            taxas_mensais = self.get_taxas_selic_mensais(data_inicio, data_fim)
-        elif indice.upper() == "IPCA-E":
-            # TODO: Implementar busca mensal do IPCA-E
-            warnings.warn("Cálculo mensal do IPCA-E ainda não implementado. Usando SELIC.")
-            taxas_mensais = self.get_taxas_selic_mensais(data_inicio, data_fim)
-        else:
+        nome_indice = indice.upper()
+        if nome_indice not in self._buscas_taxas_mensais:
             return {
                 "status": "erro",
                 "erro": f"Índice '{indice}' não suportado. Use SELIC, INPC ou IPCA-E.",
                 "total_corrigido": 0.0
             }
         
-        # Cria lista de competências (meses) entre data_inicio e data_fim
-        competencias: List[Dict[str, Any]] = []
-        data_atual = data_inicio.replace(day=1)  # Primeiro dia do mês
-        contador_mes = 1
+        # Busca as taxas (rede) em paralelo com a montagem das parcelas (CPU)
+        busca_fatores = None
+        if fatores is None:
+            busca_fatores = _POOL_BUSCAS.submit(
+                self.precomputar_fatores, data_inicio, data_fim, nome_indice
+            )
+        
+        # Cria lista de competências (meses) entre data_inicio e data_fim.
+        # Cada parcela é a tupla (numero, competencia, tipo, valor_original, deslocamento),
+        # onde deslocamento é o mês de vencimento contado a partir do início do período
+        competencias: List[Tuple[Any, str, str, float, int]] = []
         
-        # Controla meses de cada ano civil (para cálculo do 13º)
-        meses_por_ano: Dict[int, int] = {}
+        # Meses contados como ano * 12 + (mes - 1): avançar um mês é somar 1
+        indice_inicio = data_inicio.year * 12 + data_inicio.month - 1
+        indice_fim = data_fim.year * 12 + data_fim.month - 1
         
         # ===== NOVO: LÓGICA DE SALÁRIO MÍNIMO DINÂMICO =====
         rmi_base_original = rmi  # Guarda o valor original para referência
         
-        while data_atual <= data_fim:
-            ano = data_atual.year
-            mes = data_atual.month
-            competencia_str = data_atual.strftime("%m/%Y")
+        for contador_mes, indice_mes in enumerate(range(indice_inicio, indice_fim + 1), 1):
+            ano, mes = divmod(indice_mes, 12)
+            mes += 1
+            competencia_str = f"{mes:02d}/{ano}"
             
             # DETERMINA O VALOR BASE DO MÊS
             if usar_salario_minimo_dinamico:
                 # Busca o salário mínimo vigente neste mês específico
                 try:
-                    rmi_efetivo_mes = obter_salario_minimo(data_atual)
+                    rmi_efetivo_mes = obter_salario_minimo(date(ano, mes, 1))
                 except ValueError as e:
                     # Se não houver dados, usa o último valor conhecido
                     warnings.warn(f"Erro ao buscar salário mínimo para {competencia_str}: {e}")
@@ -390,34 +668,22 @@ class GerenteFinanceiroBCB:
             if tem_adicional_25:
                 rmi_efetivo_mes *= 1.25
             
-            # Conta meses do ano civil para 13º proporcional
-            if ano not in meses_por_ano:
-                meses_por_ano[ano] = 0
-            meses_por_ano[ano] += 1
-            
             # Adiciona parcela mensal de RMI
-            competencias.append({
-                "numero": contador_mes,
-                "competencia": competencia_str,
-                "tipo": "RMI Mensal",
-                "valor_original": rmi_efetivo_mes,
-                "data_vencimento": data_atual,
-                "ano": ano,
-                "mes": mes
-            })
-            
-            contador_mes += 1
-            
-            # Avança para o próximo mês
-            data_atual = data_atual + relativedelta(months=1)
+            competencias.append(
+                (contador_mes, competencia_str, "RMI Mensal", rmi_efetivo_mes, contador_mes - 1)
+            )
         
         # Adiciona 13º salário proporcional em novembro/dezembro de cada ano
         # (ou no mês final se for antes de dezembro)
-        for ano, qtd_meses in meses_por_ano.items():
+        for ano in range(data_inicio.year, data_fim.year + 1):
             # Verifica se chegou em novembro/dezembro OU se é o último ano do cálculo
             mes_final_ano = 12 if ano < data_fim.year else data_fim.month
             
             if mes_final_ano >= 11:  # Novembro ou Dezembro
+                # Meses do ano civil dentro do período (13º proporcional)
+                mes_inicial_ano = data_inicio.month if ano == data_inicio.year else 1
+                qtd_meses = mes_final_ano - mes_inicial_ano + 1
+                
                 # Busca o salário base do mês de dezembro (ou último mês do ano)
                 mes_13 = min(12, mes_final_ano)
                 data_13 = date(ano, mes_13, 1)
@@ -437,104 +703,100 @@ class GerenteFinanceiroBCB:
                 # Calcula 13º proporcional: (RMI_base / 12) × meses trabalhados no ano
                 valor_13 = (rmi_base_13 / 12) * qtd_meses
                 
-                competencia_13 = data_13.strftime("%m/%Y")
+                competencia_13 = f"{mes_13:02d}/{ano}"
                 
-                competencias.append({
-                    "numero": f"13º/{ano}",
-                    "competencia": competencia_13,
-                    "tipo": f"13º Salário {ano} (proporcional a {qtd_meses} meses)",
-                    "valor_original": valor_13,
-                    "data_vencimento": data_13,
-                    "ano": ano,
-                    "mes": mes_13
-                })
+                competencias.append((
+                    f"13º/{ano}",
+                    competencia_13,
+                    f"13º Salário {ano} (proporcional a {qtd_meses} meses)",
+                    valor_13,
+                    ano * 12 + mes_13 - 1 - indice_inicio
+                ))
         
         # CÁLCULO DE JUROS COMPOSTOS INVERTIDOS
         # Cada parcela antiga acumula TODAS as taxas desde seu vencimento até data_fim
+        # (fatores[i] já traz o produto das taxas do i-ésimo mês do período em diante)
+        quantidade_meses = indice_fim - indice_inicio + 1
+        if busca_fatores is not None:
+            fatores = busca_fatores.result()
+        if len(fatores) != quantidade_meses + 1:
+            return {
+                "status": "erro",
+                "erro": "Fatores informados não correspondem ao período do cálculo.",
+                "total_corrigido": 0.0
+            }
+        
         memoria_mensal: List[Dict[str, Any]] = []
         total_sem_correcao = 0.0
         total_corrigido = 0.0
         
-        for parcela in competencias:
-            valor_original = parcela["valor_original"]
-            data_vencimento = parcela["data_vencimento"]
-            
-            # Calcula fator de correção: multiplica (1 + taxa/100) para cada mês
-            # desde o vencimento da parcela até data_fim
-            fator_correcao = 1.0
-            data_correcao = data_vencimento
-            
-            while data_correcao <= data_fim:
-                competencia_correcao = data_correcao.strftime("%m/%Y")
-                
-                # Busca taxa do mês (se não existir, usa 0)
-                taxa_mes = taxas_mensais.get(competencia_correcao, 0.0)
-                fator_correcao *= (1 + taxa_mes / 100)
-                
-                # Avança para o próximo mês
-                data_correcao = data_correcao + relativedelta(months=1)
+        for numero, competencia, tipo, valor_original, deslocamento in competencias:
+            # Fator de correção: taxas desde o mês de vencimento da parcela até data_fim
+            fator_correcao = fatores[deslocamento]
             
             # Valor corrigido = valor original × fator de correção
             valor_corrigido = valor_original * fator_correcao
             
             # Adiciona à memória de cálculo
-            memoria_mensal.append({
-                "numero": parcela["numero"],
-                "competencia": parcela["competencia"],
-                "tipo": parcela["tipo"],
-                "valor_original": round(valor_original, 2),
-                "fator_correcao": round(fator_correcao, 6),
-                "valor_corrigido": round(valor_corrigido, 2)
-            })
+            if detalhado:
+                memoria_mensal.append({
+                    "numero": numero,
+                    "competencia": competencia,
+                    "tipo": tipo,
+                    "valor_original": round(valor_original, 2),
+                    "fator_correcao": round(fator_correcao, 6),
+                    "valor_corrigido": round(valor_corrigido, 2)
+                })
             
             # Acumula totais
             total_sem_correcao += valor_original
             total_corrigido += valor_corrigido
         
-        # Observações
+        # Observações (apenas no modo detalhado)
         observacoes = []
         
-        if usar_salario_minimo_dinamico:
-            observacoes.append(
-                "SALÁRIO MÍNIMO DINÂMICO APLICADO: O valor da RMI foi atualizado mês a mês "
-                "conforme os reajustes oficiais do salário mínimo nacional, "
-                "respeitando a legislação vigente em cada competência."
-            )
-            
-            if tem_adicional_25:
+        if detalhado:
+            if usar_salario_minimo_dinamico:
                 observacoes.append(
-                    "Acréscimo de 25% (grande invalidez) aplicado sobre o salário mínimo "
-                    "de cada mês, conforme Art. 45 da Lei 8.213/91."
+                    "SALÁRIO MÍNIMO DINÂMICO APLICADO: O valor da RMI foi atualizado mês a mês "
+                    "conforme os reajustes oficiais do salário mínimo nacional, "
+                    "respeitando a legislação vigente em cada competência."
                 )
-        else:
-            if tem_adicional_25:
+            
+                if tem_adicional_25:
+                    observacoes.append(
+                        "Acréscimo de 25% (grande invalidez) aplicado sobre o salário mínimo "
+                        "de cada mês, conforme Art. 45 da Lei 8.213/91."
+                    )
+            else:
+                if tem_adicional_25:
+                    observacoes.append(
+                        f"Acréscimo de 25% aplicado (grande invalidez). "
+                        f"RMI original: R$ {rmi:.2f} → RMI efetivo: R$ {rmi * 1.25:.2f}"
+                    )
+        
+            observacoes.append(
+                f"Índice de correção: {nome_indice} (conforme determinação judicial)."
+            )
+        
+            # Conta quantas parcelas de 13º foram calculadas
+            parcelas_13 = len(competencias) - quantidade_meses
+            if parcelas_13:
                 observacoes.append(
-                    f"Acréscimo de 25% aplicado (grande invalidez). "
-                    f"RMI original: R$ {rmi:.2f} → RMI efetivo: R$ {rmi * 1.25:.2f}"
+                    f"13º salário calculado em {parcelas_13} ano(s) "
+                    f"(proporcional aos meses trabalhados em cada ano civil)."
                 )
         
-        observacoes.append(
-            f"Índice de correção: {indice.upper()} (conforme determinação judicial)."
-        )
-        
-        # Conta quantas parcelas de 13º foram calculadas
-        parcelas_13 = [p for p in memoria_mensal if "13º" in p["tipo"]]
-        if parcelas_13:
             observacoes.append(
-                f"13º salário calculado em {len(parcelas_13)} ano(s) "
-                f"(proporcional aos meses trabalhados em cada ano civil)."
+                "Juros compostos aplicados invertidamente: "
+                "Parcela antiga acumula TODAS as taxas desde seu vencimento até a data final. "
+                "Parcela recente acumula menos taxas (conforme praxe jurídica)."
             )
         
-        observacoes.append(
-            "Juros compostos aplicados invertidamente: "
-            "Parcela antiga acumula TODAS as taxas desde seu vencimento até a data final. "
-            "Parcela recente acumula menos taxas (conforme praxe jurídica)."
-        )
-        
-        observacoes.append(
-            f"Código SELIC usado: {self.CODIGO_SELIC_MENSAL} "
-            f"(Taxa Selic acumulada no mês % - Série oficial do BCB)."
-        )
+            observacoes.append(
+                f"Código SELIC usado: {self.CODIGO_SELIC_MENSAL} "
+                f"(Taxa Selic acumulada no mês % - Série oficial do BCB)."
+            )
         
         # Monta resultado
         return {
@@ -543,9 +805,9 @@ class GerenteFinanceiroBCB:
             "rmi_com_adicional": "VARIVEL_POR_MES" if usar_salario_minimo_dinamico else round(rmi * 1.25 if tem_adicional_25 else rmi, 2),
             "tem_adicional_25": tem_adicional_25,
             "usar_salario_minimo_dinamico": usar_salario_minimo_dinamico,
-            "total_meses": len([p for p in memoria_mensal if p["tipo"] == "RMI Mensal"]),
+            "total_meses": quantidade_meses,
             "total_devido_sem_correcao": round(total_sem_correcao, 2),
-            "indice_aplicado": indice.upper(),
+            "indice_aplicado": nome_indice,
             "total_corrigido": round(total_corrigido, 2),
             "diferenca_correcao": round(total_corrigido - total_sem_correcao, 2),
             "memoria_mensal": memoria_mensal,
@@ -0,0 +1,26 @@
+"""
+Formatação de valores para exibição no padrão brasileiro.
+
+Usada tanto pelas validações do núcleo de cálculo quanto pelos relatórios
+dos agentes.
+"""
+
+from functools import lru_cache
+
+
+# Troca separadores do padrão americano (1,234.56) pelo brasileiro (1.234,56)
+_TABELA_BRL = str.maketrans({",": ".", ".": ","})
+
+
+@lru_cache(maxsize=512)
+def formatar_brl(valor: float) -> str:
+    """
+    Formata um valor monetário no padrão brasileiro (ex: R$ 1.234,56).
+
+    Args:
+        valor: Valor em Reais.
+
+    Returns:
+        String formatada com prefixo "R$".
+    """
+    return f"R$ {valor:,.2f}".translate(_TABELA_BRL)
@@ -8,6 +8,8 @@ essenciais para validação e limitação de benefícios previdenciários.
 from datetime import date
 from typing import Dict, Tuple
 
+from core.formatacao import formatar_brl
+
 
 # Histórico de Salário Mínimo Nacional
 # Formato: {ano: [(mes_inicio, valor), ...]}
@@ -162,7 +164,6 @@ def obter_faixa_salario_minimo(data_inicio: date, data_fim: date) -> Dict[str, f
 
     Exemplo:
         >>> from datetime import date
-        >>> from dateutil.relativedelta import relativedelta
         >>> faixa = obter_faixa_salario_minimo(date(2023, 1, 1), date(2023, 12, 31))
         >>> len(faixa)
         12
@@ -171,18 +172,14 @@ def obter_faixa_salario_minimo(data_inicio: date, data_fim: date) -> Dict[str, f
         >>> faixa["06/2023"]
         1320.0
     """
-    from dateutil.relativedelta import relativedelta
-
     faixa_valores = {}
-    data_atual = data_inicio.replace(day=1)  # Primeiro dia do mês
-
-    while data_atual <= data_fim:
-        competencia = data_atual.strftime("%m/%Y")
-        valor_sm = obter_salario_minimo(data_atual)
-        faixa_valores[competencia] = valor_sm
 
-        # Avança para o próximo mês
-        data_atual = data_atual + relativedelta(months=1)
+    # Meses contados como ano * 12 + (mes - 1), do mês de data_inicio ao de data_fim
+    for indice_mes in range(data_inicio.year * 12 + data_inicio.month - 1,
+                            data_fim.year * 12 + data_fim.month):
+        ano, mes = divmod(indice_mes, 12)
+        valor_sm = obter_salario_minimo(date(ano, mes + 1, 1))
+        faixa_valores[f"{mes + 1:02d}/{ano}"] = valor_sm
 
     return faixa_valores
 
@@ -201,7 +198,6 @@ def obter_faixa_teto_inss(data_inicio: date, data_fim: date) -> Dict[str, float]
 
     Exemplo:
         >>> from datetime import date
-        >>> from dateutil.relativedelta import relativedelta
         >>> faixa = obter_faixa_teto_inss(date(2023, 1, 1), date(2023, 12, 31))
         >>> len(faixa)
         12
@@ -210,18 +206,14 @@ def obter_faixa_teto_inss(data_inicio: date, data_fim: date) -> Dict[str, float]
         >>> faixa["06/2023"]
         7786.02
     """
-    from dateutil.relativedelta import relativedelta
-
     faixa_valores = {}
-    data_atual = data_inicio.replace(day=1)  # Primeiro dia do mês
-
-    while data_atual <= data_fim:
-        competencia = data_atual.strftime("%m/%Y")
-        valor_teto = obter_teto_inss(data_atual)
-        faixa_valores[competencia] = valor_teto
 
-        # Avança para o próximo mês
-        data_atual = data_atual + relativedelta(months=1)
+    # Meses contados como ano * 12 + (mes - 1), do mês de data_inicio ao de data_fim
+    for indice_mes in range(data_inicio.year * 12 + data_inicio.month - 1,
+                            data_fim.year * 12 + data_fim.month):
+        ano, mes = divmod(indice_mes, 12)
+        valor_teto = obter_teto_inss(date(ano, mes + 1, 1))
+        faixa_valores[f"{mes + 1:02d}/{ano}"] = valor_teto
 
     return faixa_valores
 
@@ -258,14 +250,14 @@ def validar_rmi(
     if rmi < salario_minimo:
         return (
             False,
-            f"RMI (R$ {rmi:,.2f}) está abaixo do salário mínimo vigente (R$ {salario_minimo:,.2f}).".replace(',', '_').replace('.', ',').replace('_', '.')
+            f"RMI ({formatar_brl(rmi)}) está abaixo do salário mínimo vigente ({formatar_brl(salario_minimo)})."
         )
 
     # Valida limite superior (teto do INSS)
     if not permitir_acima_teto and rmi > teto_inss:
         return (
             False,
-            f"RMI (R$ {rmi:,.2f}) está acima do teto do INSS (R$ {teto_inss:,.2f}).".replace(',', '_').replace('.', ',').replace('_', '.')
+            f"RMI ({formatar_brl(rmi)}) está acima do teto do INSS ({formatar_brl(teto_inss)})."
         )
 
     return (True, "RMI válida.")
@@ -34,6 +34,10 @@ class DadosTrabalhistasExtraidos(BaseModel):
     
     Este schema força o modelo de IA a retornar informações padronizadas
     e validadas sobre o vínculo empregatício e verbas rescisórias.
+
+    ATENÇÃO: Todos os campos devem ter valor default. Nos caminhos de erro o
+    agente cria o objeto vazio com `model_construct()`, que não valida nem
+    preenche campos obrigatórios.
     """
 
     nome_reclamante: Optional[str] = Field(
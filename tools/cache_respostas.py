@@ -0,0 +1,84 @@
+"""
+Cache persistente das respostas da IA indexado pelo conteúdo do PDF.
+
+Evita chamar o modelo novamente quando o mesmo documento (byte a byte) já foi
+processado com as mesmas instruções, devolvendo a resposta bruta armazenada.
+"""
+
+import hashlib
+import sqlite3
+from pathlib import Path
+from typing import Optional
+
+
+class CacheRespostasIA:
+    """
+    Cache de respostas da IA em SQLite, chaveado por SHA-256.
+
+    A chave combina os bytes do PDF com as demais partes que influenciam a
+    resposta (prompt de sistema, contexto adicional, etc.). Armazena apenas o
+    texto bruto retornado pelo modelo, nunca objetos Pydantic.
+    """
+
+    def __init__(self, caminho_banco: Path):
+        """
+        Inicializa o cache, criando o banco e a tabela se necessário.
+
+        Args:
+            caminho_banco: Caminho do arquivo SQLite usado como armazenamento.
+        """
+        caminho_banco.parent.mkdir(parents=True, exist_ok=True)
+        self._conexao = sqlite3.connect(caminho_banco, check_same_thread=False)
+        self._conexao.execute(
+            "CREATE TABLE IF NOT EXISTS respostas ("
+            "chave TEXT PRIMARY KEY, "
+            "resposta TEXT NOT NULL)"
+        )
+        self._conexao.commit()
+
+    @staticmethod
+    def gerar_chave(caminho_pdf: str, *partes: str) -> str:
+        """
+        Calcula a chave do cache a partir do conteúdo do PDF e das instruções.
+
+        Args:
+            caminho_pdf: Caminho do arquivo PDF analisado.
+            *partes: Textos adicionais que alteram a resposta esperada.
+
+        Returns:
+            Hash SHA-256 hexadecimal identificando a combinação.
+        """
+        sha = hashlib.sha256(Path(caminho_pdf).read_bytes())
+        for parte in partes:
+            sha.update(b"\0")
+            sha.update(parte.encode("utf-8"))
+        return sha.hexdigest()
+
+    def obter(self, chave: str) -> Optional[str]:
+        """
+        Busca uma resposta armazenada.
+
+        Args:
+            chave: Chave gerada por `gerar_chave`.
+
+        Returns:
+            Texto bruto da resposta, ou None se não houver registro.
+        """
+        linha = self._conexao.execute(
+            "SELECT resposta FROM respostas WHERE chave = ?", (chave,)
+        ).fetchone()
+        return linha[0] if linha else None
+
+    def salvar(self, chave: str, resposta: str) -> None:
+        """
+        Armazena a resposta bruta retornada pela IA.
+
+        Args:
+            chave: Chave gerada por `gerar_chave`.
+            resposta: Texto bruto retornado pelo modelo.
+        """
+        self._conexao.execute(
+            "INSERT OR REPLACE INTO respostas (chave, resposta) VALUES (?, ?)",
+            (chave, resposta)
+        )
+        self._conexao.commit()
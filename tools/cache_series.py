@@ -0,0 +1,84 @@
+"""
+Cache persistente das séries temporais do SGS/BCB (SELIC, INPC, IPCA-E).
+
+As séries mensais do Banco Central só crescem: a cada mês é publicado um novo
+ponto e os meses fechados não mudam. Os pontos já baixados ficam em disco e,
+nas consultas seguintes, apenas os meses ainda não armazenados são buscados
+na API.
+"""
+
+import sqlite3
+import threading
+from datetime import date
+from pathlib import Path
+from typing import List, Tuple
+
+
+class CacheSeriesSGS:
+    """
+    Cache de pontos das séries do SGS em SQLite, chaveado por (código, data).
+
+    Armazena apenas meses já encerrados: o ponto do mês corrente pode ser
+    revisado pelo BCB e é sempre buscado novamente na API.
+
+    A conexão é compartilhada entre threads; quem confere o que está armazenado
+    e depois busca e grava o que falta deve segurar `trava` durante toda a
+    sequência, para que buscas concorrentes não gravem trechos desencontrados.
+    """
+
+    def __init__(self, caminho_banco: Path):
+        """
+        Inicializa o cache, criando o banco e a tabela se necessário.
+
+        Args:
+            caminho_banco: Caminho do arquivo SQLite usado como armazenamento.
+        """
+        caminho_banco.parent.mkdir(parents=True, exist_ok=True)
+        self._conexao = sqlite3.connect(caminho_banco, check_same_thread=False)
+        self._conexao.execute(
+            "CREATE TABLE IF NOT EXISTS pontos ("
+            "codigo INTEGER NOT NULL, "
+            "data TEXT NOT NULL, "
+            "valor REAL NOT NULL, "
+            "PRIMARY KEY (codigo, data))"
+        )
+        self._conexao.commit()
+        self.trava = threading.RLock()
+
+    def obter(self, codigo: int, data_inicio: date, data_fim: date) -> List[Tuple[date, float]]:
+        """
+        Busca os pontos armazenados de uma série dentro de um período.
+
+        Args:
+            codigo: Código da série no SGS.
+            data_inicio: Data inicial do período (inclusive).
+            data_fim: Data final do período (inclusive).
+
+        Returns:
+            Lista de (data, valor) em ordem cronológica.
+        """
+        linhas = self._conexao.execute(
+            "SELECT data, valor FROM pontos "
+            "WHERE codigo = ? AND data BETWEEN ? AND ? ORDER BY data",
+            (codigo, data_inicio.isoformat(), data_fim.isoformat())
+        ).fetchall()
+        return [(date.fromisoformat(data), valor) for data, valor in linhas]
+
+    def salvar(self, codigo: int, pontos: List[Tuple[date, float]]) -> None:
+        """
+        Armazena os pontos de meses já encerrados de uma série.
+
+        Args:
+            codigo: Código da série no SGS.
+            pontos: Lista de (data, valor) retornada pela API.
+        """
+        inicio_mes_atual = date.today().replace(day=1)
+        self._conexao.executemany(
+            "INSERT OR REPLACE INTO pontos (codigo, data, valor) VALUES (?, ?, ?)",
+            [
+                (codigo, data.isoformat(), valor)
+                for data, valor in pontos
+                if data < inicio_mes_atual
+            ]
+        )
+        self._conexao.commit()
@@ -5,10 +5,150 @@ Esta toolkit permite que agentes de IA extraiam texto de documentos PDF,
 essencial para análise de reclamações trabalhistas e outros documentos legais.
 """
 
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
+from typing import Iterator, List, Tuple, Union
 
 from agno.tools import Toolkit
-from pypdf import PdfReader
+from pypdf import PageObject, PdfReader
+
+
+# Abaixo desta quantidade de páginas, repartir a extração entre processos
+# custa mais do que extrair tudo no processo atual
+MIN_PAGINAS_PARALELO = 8
+
+# PDFs acima deste tamanho (em geral digitalizações enormes) têm apenas as
+# primeiras e as últimas páginas extraídas: a consulta à IA é limitada de
+# qualquer forma e a extração completa travaria o agente por minutos
+LIMITE_BYTES_PDF = 50 * 1024 * 1024
+PAGINAS_INICIAIS_PDF_GRANDE = 20
+PAGINAS_FINAIS_PDF_GRANDE = 5
+
+
+@lru_cache(maxsize=1)
+def obter_pool_extracao() -> ProcessPoolExecutor:
+    """
+    Retorna o pool de processos compartilhado para extração de páginas.
+
+    Returns:
+        Instância única de `ProcessPoolExecutor` com um processo por núcleo,
+        reaproveitada entre PDFs (e entre threads que leem PDFs em paralelo).
+    """
+    return ProcessPoolExecutor(max_workers=os.cpu_count())
+
+
+@contextmanager
+def abrir_pdf(caminho_pdf: Union[str, Path]) -> Iterator[PdfReader]:
+    """
+    Abre um PDF para leitura mapeando o arquivo em memória (mmap).
+
+    Com um caminho, o pypdf copia o arquivo inteiro para a memória antes de
+    ler; com o mapeamento, o sistema carrega sob demanda só as partes acessadas
+    e os processos de extração compartilham as mesmas páginas em cache.
+
+    Args:
+        caminho_pdf: Caminho do arquivo PDF.
+
+    Yields:
+        `PdfReader` válido enquanto o contexto estiver aberto.
+    """
+    with open(caminho_pdf, "rb") as arquivo:
+        # Arquivo vazio não pode ser mapeado: o pypdf reporta o erro adequado
+        if os.fstat(arquivo.fileno()).st_size == 0:
+            yield PdfReader(arquivo)
+            return
+
+        with mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            yield PdfReader(mapa)
+
+
+def _extrair_texto_pagina(page: PageObject) -> str:
+    """
+    Extrai o texto de uma página, pulando páginas que não podem conter texto.
+
+    Texto exige uma fonte nos recursos da página (ou de um XObject de formulário).
+    Páginas cujos recursos têm apenas imagens (ex: digitalizações sem OCR) são
+    puladas sem decodificar as imagens, o que é a parte cara da extração.
+    """
+    recursos = page.get("/Resources")
+    recursos = recursos.get_object() if recursos is not None else {}
+    if "/Font" not in recursos:
+        xobjects = recursos.get("/XObject")
+        xobjects = xobjects.get_object() if xobjects is not None else {}
+        if all(xobjects[nome].get("/Subtype") == "/Image" for nome in xobjects):
+            return ""
+
+    return page.extract_text()
+
+
+def _pdf_grande(tamanho: int, total_paginas: int) -> bool:
+    """Indica se o PDF deve ter apenas as páginas iniciais e finais extraídas."""
+    return (
+        tamanho > LIMITE_BYTES_PDF
+        and total_paginas > PAGINAS_INICIAIS_PDF_GRANDE + PAGINAS_FINAIS_PDF_GRANDE
+    )
+
+
+def _extrair_intervalo(caminho_pdf: str, inicio: int, fim: int) -> List[str]:
+    """
+    Extrai o texto das páginas [inicio, fim) de um PDF (executa em outro processo).
+
+    Cada processo abre o próprio `PdfReader`, pois o objeto não é serializável.
+    """
+    with abrir_pdf(caminho_pdf) as reader:
+        return [_extrair_texto_pagina(reader.pages[indice]) for indice in range(inicio, fim)]
+
+
+@lru_cache(maxsize=32)
+def _extrair_textos_paginas(caminho_pdf: str, mtime_ns: int, tamanho: int) -> Tuple[str, ...]:
+    """
+    Extrai o texto de cada página, em paralelo quando o PDF é grande.
+
+    A extração é CPU-bound e independente por página: PDFs com muitas páginas
+    são divididos em blocos contíguos, extraídos em processos separados e
+    reunidos na ordem original.
+
+    O resultado fica em cache em memória: `mtime_ns` e `tamanho` entram apenas
+    na chave, de modo que um arquivo alterado é lido novamente.
+
+    Args:
+        caminho_pdf: Caminho absoluto do arquivo PDF.
+        mtime_ns: Data de modificação do arquivo (`st_mtime_ns`).
+        tamanho: Tamanho do arquivo em bytes (`st_size`).
+
+    Returns:
+        Tupla com o texto de cada página, na ordem do documento.
+    """
+    with abrir_pdf(caminho_pdf) as reader:
+        total_paginas = len(reader.pages)
+
+        if _pdf_grande(tamanho, total_paginas):
+            # Páginas do meio ficam vazias, como páginas sem texto
+            inicio_finais = total_paginas - PAGINAS_FINAIS_PDF_GRANDE
+            return tuple(
+                _extrair_texto_pagina(reader.pages[indice])
+                if indice < PAGINAS_INICIAIS_PDF_GRANDE or indice >= inicio_finais
+                else ""
+                for indice in range(total_paginas)
+            )
+
+        processos = os.cpu_count() or 1
+        if total_paginas < MIN_PAGINAS_PARALELO or processos < 2:
+            return tuple(_extrair_texto_pagina(page) for page in reader.pages)
+
+    tamanho_bloco = -(-total_paginas // processos)  # Divisão arredondada para cima
+    inicios = range(0, total_paginas, tamanho_bloco)
+    fins = [min(inicio + tamanho_bloco, total_paginas) for inicio in inicios]
+
+    blocos = obter_pool_extracao().map(
+        _extrair_intervalo, repeat(caminho_pdf), inicios, fins
+    )
+    return tuple(texto for bloco in blocos for texto in bloco)
 
 
 class LegalPDFReader(Toolkit):
@@ -22,6 +162,8 @@ class LegalPDFReader(Toolkit):
     def __init__(self):
         """Inicializa a toolkit e registra o método de leitura."""
         super().__init__(name="legal_pdf_reader")
+        # Registrada como função síncrona (sem async_tools): a leitura é CPU-bound
+        # e já usa processos em PDFs grandes; um executor/async só somaria overhead
         self.register(self.read_pdf_text)
 
     def read_pdf_text(self, pdf_path: str) -> str:
@@ -52,15 +194,16 @@ class LegalPDFReader(Toolkit):
             if not file_path.is_file():
                 return f"Erro: '{pdf_path}' não é um arquivo válido."
 
-            # Abre e processa o PDF
-            reader = PdfReader(file_path)
-            
-            # Extrai texto de todas as páginas
+            # Extrai texto de todas as páginas (reaproveitado se o arquivo não mudou)
+            estado = file_path.stat()
+            textos_paginas = _extrair_textos_paginas(
+                str(file_path.resolve()), estado.st_mtime_ns, estado.st_size
+            )
+            total_paginas = len(textos_paginas)
+
             texto_completo = []
-            total_paginas = len(reader.pages)
 
-            for numero_pagina, page in enumerate(reader.pages, start=1):
-                texto_pagina = page.extract_text()
+            for numero_pagina, texto_pagina in enumerate(textos_paginas, start=1):
                 if texto_pagina:  # Adiciona apenas se houver texto
                     texto_completo.append(f"--- Página {numero_pagina}/{total_paginas} ---\n")
                     texto_completo.append(texto_pagina)
@@ -69,10 +212,18 @@ class LegalPDFReader(Toolkit):
             if not texto_completo:
                 return f"Aviso: O PDF '{pdf_path}' foi lido, mas não contém texto extraível. Pode ser um PDF digitalizado sem OCR."
 
+            if _pdf_grande(estado.st_size, total_paginas):
+                texto_completo.insert(
+                    0,
+                    f"--- PDF extenso ({estado.st_size // (1024 * 1024)} MB, {total_paginas} páginas): "
+                    f"extraídas apenas as {PAGINAS_INICIAIS_PDF_GRANDE} primeiras e as "
+                    f"{PAGINAS_FINAIS_PDF_GRANDE} últimas páginas ---\n\n"
+                )
+
             return "".join(texto_completo)
 
         except PermissionError:
             return f"Erro: Sem permissão para ler o arquivo '{pdf_path}'. Verifique as permissões."
 
         except Exception as e:
-            return f"Erro ao processar o PDF '{pdf_path}': {type(e).__name__} - {str(e)}"
\ No newline at end of file
+            return f"Erro ao processar o PDF '{pdf_path}': {type(e).__name__} - {str(e)}"
@@ -0,0 +1,188 @@
+"""
+Pré-extração determinística de dados de Reclamações Trabalhistas padronizadas.
+
+Petições geradas a partir de modelos trazem admissão, dispensa, salário, motivo
+da dispensa e observações em campos rotulados ("Data de Admissão: 01/09/2021")
+e os pedidos em uma seção própria ("DOS PEDIDOS"). Quando todos esses campos e
+a seção são encontrados por expressões regulares, os dados são montados sem
+chamar a IA; caso contrário, o fluxo normal com o agente é mantido.
+"""
+
+import re
+from datetime import date
+from typing import List, Optional
+
+from models.schemas import Adicionais, DadosTrabalhistasExtraidos
+
+
+# Campos rotulados dos modelos de petição (datas em dd/mm/aaaa, valores em R$)
+_DATA = r"(\d{2})/(\d{2})/(\d{4})"
+_VALOR = r"R\$\s*([\d.,]+\d)"
+
+_ADMISSAO_RE = re.compile(r"Data\s+de\s+Admiss[ãa]o\s*:\s*" + _DATA, re.IGNORECASE)
+_DISPENSA_RE = re.compile(r"Data\s+de\s+(?:Dispensa|Demiss[ãa]o)\s*:\s*" + _DATA, re.IGNORECASE)
+_SALARIO_RE = re.compile(r"Sal[áa]rio\s+Base\s*:\s*" + _VALOR, re.IGNORECASE)
+_RECLAMANTE_RE = re.compile(r"Reclamante\s*:\s*([^\n]+)", re.IGNORECASE)
+_INSALUBRIDADE_RE = re.compile(r"Adicional\s+de\s+Insalubridade\s*:\s*" + _VALOR, re.IGNORECASE)
+_PERICULOSIDADE_RE = re.compile(r"Adicional\s+de\s+Periculosidade\s*:\s*" + _VALOR, re.IGNORECASE)
+_NOTURNO_RE = re.compile(r"Adicional\s+Noturno\s*:\s*" + _VALOR, re.IGNORECASE)
+_MOTIVO_DISPENSA_RE = re.compile(
+    r"Motivo\s+da\s+(?:Dispensa|Demiss[ãa]o|Rescis[ãa]o)\s*:[ \t]*([^\n]*)", re.IGNORECASE
+)
+_OBSERVACOES_RE = re.compile(r"Observa[çc][õo]es\s*:[ \t]*([^\n]*)", re.IGNORECASE)
+
+# Seção de pedidos: do título "DOS PEDIDOS" até o próximo título em maiúsculas
+# ("DO VALOR DA CAUSA", "III - DAS PROVAS"...) ou o fim do texto
+_SECAO_PEDIDOS_RE = re.compile(
+    r"^[ \t]*(?:[IVXLC]+[ \t]*[-–.)][ \t]*)?DOS[ \t]+PEDIDOS\b[^\n]*\n"
+    r"(.*?)"
+    r"(?=^[ \t]*(?:[IVXLC]+[ \t]*[-–.)][ \t]*)?D[AO]S?[ \t]+[A-ZÀ-Ú][A-ZÀ-Ú \t]*$|\Z)",
+    re.MULTILINE | re.DOTALL
+)
+
+# Verbas padronizadas do schema e os termos que as identificam na seção de pedidos
+_VERBAS_RE = {
+    "saldo_salario": re.compile(r"saldo\s+de\s+sal[áa]rio", re.IGNORECASE),
+    "fgts": re.compile(r"\bFGTS\b", re.IGNORECASE),
+    "multa_40": re.compile(r"multa\s+de\s+40\s*%", re.IGNORECASE),
+    "aviso_previo": re.compile(r"aviso\s+pr[ée]vio", re.IGNORECASE),
+    "decimo_terceiro": re.compile(r"13[ºo°]\s+sal[áa]rio|d[ée]cimo\s+terceiro", re.IGNORECASE),
+    "ferias_proporcionais": re.compile(r"f[ée]rias\s+proporcionais", re.IGNORECASE),
+}
+
+_MULTA_467_RE = re.compile(r"art(?:igo|\.)?\s*467", re.IGNORECASE)
+_MULTA_477_RE = re.compile(r"art(?:igo|\.)?\s*477", re.IGNORECASE)
+
+# Valores aceitos no campo "Motivo da dispensa:" (o campo inteiro deve corresponder)
+_MOTIVOS_DISPENSA = (
+    (re.compile(r"(?:dispensa\s+)?sem\s+justa\s+causa", re.IGNORECASE), "sem justa causa"),
+    (re.compile(r"(?:dispensa\s+)?(?:com\s+|por\s+)?justa\s+causa", re.IGNORECASE), "justa causa"),
+    (re.compile(r"pedido\s+de\s+demiss[ãa]o", re.IGNORECASE), "pedido de demissão"),
+)
+_SEM_OBSERVACOES = {"", "-", "nenhuma", "nenhum", "não há", "nao ha"}
+
+
+def _converter_data(correspondencia: Optional[re.Match]) -> Optional[date]:
+    """Converte os grupos (dia, mês, ano) de uma correspondência em date."""
+    if not correspondencia:
+        return None
+    dia, mes, ano = correspondencia.groups()
+    try:
+        return date(int(ano), int(mes), int(dia))
+    except ValueError:
+        return None
+
+
+def _converter_valor(correspondencia: Optional[re.Match]) -> Optional[float]:
+    """
+    Converte um valor monetário brasileiro ("3.158,96" ou "3158,96") em float.
+    """
+    if not correspondencia:
+        return None
+    texto = correspondencia.group(1)
+    if "," in texto:
+        texto = texto.replace(".", "").replace(",", ".")
+    elif re.fullmatch(r"\d{1,3}(?:\.\d{3})+", texto):
+        texto = texto.replace(".", "")
+    try:
+        return float(texto)
+    except ValueError:
+        return None
+
+
+def _converter_motivo(correspondencia: Optional[re.Match]) -> Optional[str]:
+    """
+    Converte o campo "Motivo da dispensa:" em um dos motivos padronizados.
+
+    Retorna None quando o campo não existe ou traz um texto fora dos motivos
+    conhecidos (ex: "não foi sem justa causa"), deixando o caso para a IA.
+    """
+    if not correspondencia:
+        return None
+    motivo = correspondencia.group(1).strip().rstrip(".;")
+    for padrao, justificativa in _MOTIVOS_DISPENSA:
+        if padrao.fullmatch(motivo):
+            return justificativa
+    return None
+
+
+def _converter_observacoes(correspondencia: Optional[re.Match]) -> Optional[List[str]]:
+    """
+    Converte o campo "Observações:" (itens separados por ";") em lista.
+
+    Retorna None quando o campo não existe; "Nenhuma" resulta em lista vazia.
+    """
+    if not correspondencia:
+        return None
+    texto = correspondencia.group(1).strip().rstrip(".")
+    if texto.lower() in _SEM_OBSERVACOES:
+        return []
+    return [item.strip() for item in texto.split(";") if item.strip()]
+
+
+def pre_extrair_dados_trabalhistas(texto: str) -> Optional[DadosTrabalhistasExtraidos]:
+    """
+    Tenta extrair os dados trabalhistas sem IA, a partir de campos rotulados.
+
+    Args:
+        texto: Texto completo do PDF (ex: saída de `LegalPDFReader.read_pdf_text`).
+
+    Verbas e multas dos arts. 467/477 são procuradas apenas na seção "DOS
+    PEDIDOS", para não confundir menções na narrativa dos fatos com pedidos.
+
+    Returns:
+        Dados extraídos quando admissão, dispensa, salário base, motivo da
+        dispensa, observações e a seção de pedidos (com ao menos uma verba)
+        forem encontrados; None caso contrário, indicando que a extração deve
+        seguir pela IA.
+    """
+    data_admissao = _converter_data(_ADMISSAO_RE.search(texto))
+    data_dispensa = _converter_data(_DISPENSA_RE.search(texto))
+    salario_base = _converter_valor(_SALARIO_RE.search(texto))
+
+    if not data_admissao or not data_dispensa or not salario_base:
+        return None
+
+    if data_dispensa <= data_admissao:
+        return None
+
+    justificativa = _converter_motivo(_MOTIVO_DISPENSA_RE.search(texto))
+    observacoes = _converter_observacoes(_OBSERVACOES_RE.search(texto))
+    secao_pedidos = _SECAO_PEDIDOS_RE.search(texto)
+
+    if not justificativa or observacoes is None or not secao_pedidos:
+        return None
+
+    pedidos = secao_pedidos.group(1)
+    verbas_requeridas: List[str] = [
+        verba for verba, padrao in _VERBAS_RE.items() if padrao.search(pedidos)
+    ]
+    if not verbas_requeridas:
+        return None
+
+    insalubridade = _converter_valor(_INSALUBRIDADE_RE.search(texto))
+    periculosidade = _converter_valor(_PERICULOSIDADE_RE.search(texto))
+    noturno = _converter_valor(_NOTURNO_RE.search(texto))
+    adicionais = None
+    if insalubridade or periculosidade or noturno:
+        adicionais = Adicionais.model_construct(
+            insalubridade=insalubridade,
+            periculosidade=periculosidade,
+            noturno=noturno
+        )
+
+    reclamante = _RECLAMANTE_RE.search(texto)
+
+    # Valores já convertidos para os tipos do schema: dispensa nova validação
+    return DadosTrabalhistasExtraidos.model_construct(
+        nome_reclamante=reclamante.group(1).strip() if reclamante else None,
+        data_admissao=data_admissao,
+        data_dispensa=data_dispensa,
+        salario_base=salario_base,
+        adicionais=adicionais,
+        verbas_requeridas=verbas_requeridas,
+        justificativa_demissao=justificativa,
+        observacoes=observacoes,
+        multa_467_requerida=bool(_MULTA_467_RE.search(pedidos)),
+        multa_477_requerida=bool(_MULTA_477_RE.search(pedidos))
+    )